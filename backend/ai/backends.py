@@ -0,0 +1,97 @@
+import contextlib
+import torch
+from torch import nn
+
+BACKENDS = ('eager', 'torchscript', 'onnx')
+
+
+class LogitsOnly(nn.Module):
+    """Export wrapper: images (b, 3, 224, 224) -> pred_logits (b, queries, classes + 1)."""
+
+    def __init__(self, model):
+        super().__init__()
+        self.model = model
+
+    def forward(self, inputs):
+        return self.model(inputs, return_boxes=False)['pred_logits']
+
+
+@contextlib.contextmanager
+def _without_mha_fastpath():
+    # The fused TransformerEncoderLayer kernel has no ONNX symbolic and hides
+    # the layer structure from the tracer, so export the plain ops instead.
+    mha = getattr(torch.backends, 'mha', None)
+    if mha is None:
+        yield
+        return
+    previous = mha.get_fastpath_enabled()
+    mha.set_fastpath_enabled(False)
+    try:
+        yield
+    finally:
+        mha.set_fastpath_enabled(previous)
+
+
+def export_torchscript(model, path, size=224):
+    model.eval()
+    example = torch.randn(1, 3, size, size)
+    with _without_mha_fastpath(), torch.no_grad():
+        traced = torch.jit.trace(LogitsOnly(model), example)
+        traced = torch.jit.freeze(traced)
+    traced.save(path)
+
+
+def export_onnx(model, path, size=224, opset_version=17):
+    model.eval()
+    example = torch.randn(1, 3, size, size)
+    with _without_mha_fastpath(), torch.no_grad():
+        torch.onnx.export(
+            LogitsOnly(model), example, path,
+            input_names=['images'], output_names=['pred_logits'],
+            dynamic_axes={'images': {0: 'batch'}, 'pred_logits': {0: 'batch'}},
+            opset_version=opset_version,
+        )
+
+
+class EagerBackend:
+    """Runs the DETR Python module through PyTorch eager mode."""
+    name = 'eager'
+
+    def __init__(self, model):
+        self.model = model
+
+    def __call__(self, batch):
+        with torch.inference_mode():
+            return self.model(batch, return_boxes=False)['pred_logits']
+
+
+class TorchScriptBackend:
+    """Runs a traced, frozen TorchScript export (see export_torchscript)."""
+    name = 'torchscript'
+
+    def __init__(self, path):
+        self.module = torch.jit.load(path, map_location='cpu')
+        self.module.eval()
+
+    def __call__(self, batch):
+        with torch.inference_mode():
+            return self.module(batch)
+
+
+class OnnxRuntimeBackend:
+    """Runs an ONNX export (see export_onnx) with ONNX Runtime on CPU."""
+    name = 'onnx'
+
+    def __init__(self, path, threads=None):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = threads
+        self.session = ort.InferenceSession(path, options, providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, batch):
+        logits = self.session.run(['pred_logits'], {self.input_name: batch.cpu().numpy()})[0]
+        return torch.from_numpy(logits)
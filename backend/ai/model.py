@@ -40,7 +40,8 @@ def build_2d_sincos_position_embedding(height: int, width: int, dim: int, device
 
 class DETR(nn.Module):
     def __init__(self, num_classes, hidden_dim=256, nheads=8,
-                 num_encoder_layers=1, num_decoder_layers=1, num_queries=25):
+                 num_encoder_layers=1, num_decoder_layers=1, num_queries=25,
+                 pretrained_backbone=True):
         super().__init__()
         
         # Initialize logger and model handler
@@ -56,17 +57,21 @@ class DETR(nn.Module):
             "Encoder Layers": num_encoder_layers,
             "Decoder Layers": num_decoder_layers,
             "Object Queries": num_queries,
-            "Backbone": "ResNet-50 (ImageNet pretrained)"
+            "Backbone": "ResNet-50 (ImageNet pretrained)" if pretrained_backbone else "ResNet-50"
         }
         self.model_handler.log_model_architecture(model_config)
 
-        # create ResNet-50 backbone
-        self.backbone = resnet50(weights=ResNet50_Weights.IMAGENET1K_V1)
+        # create ResNet-50 backbone (skip the ImageNet download when a checkpoint
+        # will overwrite the weights anyway)
+        self.backbone = resnet50(weights=ResNet50_Weights.IMAGENET1K_V1 if pretrained_backbone else None)
         self.backbone.fc = nn.Identity()
 
         # create conversion layer
         self.conv = nn.Conv2d(2048, hidden_dim, 1)
 
+        # optional fused replacement for backbone + conv (INT8 variant, see ai/quantization.py)
+        self.backbone_body = None
+
         # create a default PyTorch transformer
         self.transformer = nn.Transformer(
             hidden_dim, nheads, num_encoder_layers, num_decoder_layers, batch_first=True, dropout=0.1)
@@ -85,40 +90,98 @@ class DETR(nn.Module):
         self.norm_src = nn.LayerNorm(hidden_dim)
         self.norm_tgt = nn.LayerNorm(hidden_dim)
 
-    def forward(self, inputs):
-        # propagate inputs through ResNet-50 up to avg-pool layer
-        x = self.backbone.conv1(inputs)
-        x = self.backbone.bn1(x)
-        x = self.backbone.relu(x)
-        x = self.backbone.maxpool(x)
-
-        x = self.backbone.layer1(x)
-        x = self.backbone.layer2(x)
-        x = self.backbone.layer3(x)
-        x = self.backbone.layer4(x)
+        # inference mode state (see enable_inference_mode)
+        self.inference = False
+        self.channels_last = False
+        self._pos_cache = {}
+        self._query_tgt = None
+
+    def enable_inference_mode(self, channels_last=False):
+        """Switch to an eval-only fast path.
+
+        Positional encodings are cached per (Hf, Wf, d, device), the decoder
+        target norm_tgt(0 + query_pos) is computed once, and optionally the
+        weights and inputs use the channels_last memory format. Calling
+        ``train()`` leaves inference mode again.
+        """
+        self.eval()
+        self.requires_grad_(False)
+        self.inference = True
+        self._pos_cache = {}
+
+        with torch.no_grad():
+            self._query_tgt = self.norm_tgt(self.query_pos).unsqueeze(0)  # (1, num_queries, d)
+
+        self.channels_last = channels_last
+        if channels_last:
+            self.to(memory_format=torch.channels_last)
+        return self
+
+    def train(self, mode=True):
+        if mode and getattr(self, 'inference', False):
+            self.inference = False
+            self._pos_cache = {}
+            self._query_tgt = None
+            self.requires_grad_(True)
+        return super().train(mode)
+
+    def _position_embedding(self, Hf, Wf, d_model, device):
+        if not self.inference:
+            return build_2d_sincos_position_embedding(Hf, Wf, d_model, device=device)
+
+        key = (Hf, Wf, d_model, device)
+        pos = self._pos_cache.get(key)
+        if pos is None:
+            pos = build_2d_sincos_position_embedding(Hf, Wf, d_model, device=device)
+            self._pos_cache[key] = pos
+        return pos
+
+    def _query_target(self, bsz, d_model, device):
+        if self.inference:
+            return self._query_tgt.to(device).expand(bsz, -1, -1)
 
-        # convert from 2048 to hidden_dim feature planes for the transformer
-        feat = self.conv(x)  # (b, d, Hf, Wf)
+        # decoder target: zero content + learned query positional encodings
+        tgt = torch.zeros(bsz, self.num_queries, d_model, device=device)
+        query_pos = self.query_pos.unsqueeze(0).expand(bsz, -1, -1)
+        return self.norm_tgt(tgt + query_pos)
+
+    def forward(self, inputs, return_boxes=True):
+        if self.channels_last:
+            inputs = inputs.contiguous(memory_format=torch.channels_last)
+
+        if self.backbone_body is not None:
+            feat = self.backbone_body(inputs)  # (b, d, Hf, Wf)
+        else:
+            # propagate inputs through ResNet-50 up to avg-pool layer
+            x = self.backbone.conv1(inputs)
+            x = self.backbone.bn1(x)
+            x = self.backbone.relu(x)
+            x = self.backbone.maxpool(x)
+
+            x = self.backbone.layer1(x)
+            x = self.backbone.layer2(x)
+            x = self.backbone.layer3(x)
+            x = self.backbone.layer4(x)
+
+            # convert from 2048 to hidden_dim feature planes for the transformer
+            feat = self.conv(x)  # (b, d, Hf, Wf)
         bsz, d_model, Hf, Wf = feat.shape
         src = feat.flatten(2).permute(0, 2, 1)  # (b, Hf*Wf, d)
 
         # dynamic 2D sine-cos positional encoding
-        pos = build_2d_sincos_position_embedding(Hf, Wf, d_model, device=feat.device)  # (1, Hf*Wf, d)
+        pos = self._position_embedding(Hf, Wf, d_model, feat.device)  # (1, Hf*Wf, d)
         src = self.norm_src(src + pos)
 
-        # decoder target: zero content + learned query positional encodings
-        tgt = torch.zeros(bsz, self.num_queries, d_model, device=feat.device)
-        query_pos = self.query_pos.unsqueeze(0).expand(bsz, -1, -1)
-        tgt = self.norm_tgt(tgt + query_pos)
+        tgt = self._query_target(bsz, d_model, feat.device)
 
         # propagate through the transformer
         hs = self.transformer(src=src, tgt=tgt)  # (b, num_queries, d)
 
         # finally project transformer outputs to class labels and bounding boxes
-        return {
-            'pred_logits': self.linear_class(hs),
-            'pred_boxes': self.linear_bbox(hs).sigmoid()
-        }
+        outputs = {'pred_logits': self.linear_class(hs)}
+        if return_boxes:
+            outputs['pred_boxes'] = self.linear_bbox(hs).sigmoid()
+        return outputs
     
     def log_model_info(self):
         """Log model parameter information."""
@@ -129,7 +192,13 @@ class DETR(nn.Module):
     def load_pretrained(self, checkpoint_path: str):
         """Load pretrained weights with logging."""
         try:
-            self.load_state_dict(torch.load(checkpoint_path))
+            from utils.weights import load_state_dict_mmap
+
+            # Map the checkpoint instead of copying it so processes share the
+            # pages; the mapped tensors live on the CPU, so move back after
+            device = next(self.parameters()).device
+            load_state_dict_mmap(self, checkpoint_path)
+            self.to(device)
             self.model_handler.log_model_loading(checkpoint_path, success=True)
         except Exception as e:
             self.logger.error(f"Failed to load checkpoint: {str(e)}")
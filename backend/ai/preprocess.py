@@ -0,0 +1,122 @@
+import base64
+import cv2
+import numpy as np
+import torch
+
+IMAGENET_MEAN = (0.485, 0.456, 0.406)
+IMAGENET_STD = (0.229, 0.224, 0.225)
+
+# cv2 flags that let libjpeg decode straight to 1/2, 1/4 or 1/8 scale
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+
+
+def jpeg_size(data):
+    """Read (width, height) from a JPEG header without decoding, or None."""
+    buf = memoryview(data)
+    if len(buf) < 4 or buf[0] != 0xFF or buf[1] != 0xD8:
+        return None
+
+    i = 2
+    while i + 9 < len(buf):
+        if buf[i] != 0xFF:
+            return None
+        marker = buf[i + 1]
+        if marker == 0xFF:  # fill byte
+            i += 1
+            continue
+        if marker == 0x01 or 0xD0 <= marker <= 0xD8:  # markers without payload
+            i += 2
+            continue
+        # SOFn frame headers carry the image size (DHT/JPG/DAC share the range)
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = (buf[i + 5] << 8) | buf[i + 6]
+            width = (buf[i + 7] << 8) | buf[i + 8]
+            return width, height
+        i += 2 + ((buf[i + 2] << 8) | buf[i + 3])
+
+    return None
+
+
+class FramePreprocessor:
+    """Fused, allocation-free replacement for the albumentations frame pipeline.
+
+    Equivalent to ``cvtColor(BGR2RGB) -> Resize -> Normalize -> ToTensorV2``
+    but the channel swap and mean/std normalization are folded into a single
+    multiply-add per channel that writes straight into a preallocated
+    (N, 3, size, size) batch tensor. Large JPEGs are decoded at reduced scale
+    by libjpeg when that still leaves at least ``size`` pixels per side.
+
+    The returned batch is a view of the internal buffer and is overwritten by
+    the next call, so a preprocessor must not be shared between concurrent
+    callers.
+    """
+
+    def __init__(self, size=224, max_batch_size=16, mean=IMAGENET_MEAN, std=IMAGENET_STD,
+                 reduced_decode=True):
+        self.size = size
+        self.reduced_decode = reduced_decode
+
+        std = np.asarray(std, dtype=np.float32)
+        mean = np.asarray(mean, dtype=np.float32)
+        # out[c] = rgb[c] / (255 * std[c]) - mean[c] / std[c]
+        self._scale = 1.0 / (255.0 * std)
+        self._bias = -mean / std
+
+        self._resized = np.empty((size, size, 3), dtype=np.uint8)
+        self._allocate(max(1, max_batch_size))
+
+    def _allocate(self, capacity):
+        self.buffer = torch.empty(capacity, 3, self.size, self.size, dtype=torch.float32)
+        self._array = self.buffer.numpy()
+
+    def decode(self, image_data):
+        """Decode a JPEG (bytes or base64 data URL) to a BGR image, or None."""
+        if isinstance(image_data, str):
+            if "base64," in image_data:
+                image_data = image_data.split("base64,")[1]
+            image_data = base64.b64decode(image_data)
+
+        flag = cv2.IMREAD_COLOR
+        if self.reduced_decode:
+            dims = jpeg_size(image_data)
+            if dims:
+                for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+                    if min(dims) // factor >= self.size:
+                        flag = reduced_flag
+                        break
+
+        return cv2.imdecode(np.frombuffer(image_data, np.uint8), flag)
+
+    def write(self, frame, index, out=None):
+        """Resize and normalize one BGR frame into row ``index`` of the buffer (or ``out``)."""
+        resized = cv2.resize(frame, (self.size, self.size), dst=self._resized,
+                             interpolation=cv2.INTER_LINEAR)
+        out = (self._array if out is None else out)[index]
+        for c in range(3):
+            # BGR -> RGB swap happens by reading channel 2 - c
+            np.multiply(resized[:, :, 2 - c], self._scale[c], out=out[c], dtype=np.float32)
+            np.add(out[c], self._bias[c], out=out[c])
+
+    def __call__(self, frames, out=None):
+        """Preprocess decoded frames (None entries are skipped).
+
+        Returns ``(batch, indices)`` where ``batch`` is a view of the reusable
+        buffer and ``indices`` maps its rows back to positions in ``frames``.
+        With ``out`` (a float32 (N, 3, size, size) array, e.g. shared memory)
+        the rows are written there instead and ``batch`` is a view of it.
+        """
+        if out is None and len(frames) > self.buffer.shape[0]:
+            self._allocate(len(frames))
+
+        indices = []
+        for i, frame in enumerate(frames):
+            if frame is None: continue
+            self.write(frame, len(indices), out=out)
+            indices.append(i)
+
+        batch = self.buffer if out is None else torch.from_numpy(out)
+        return batch[:len(indices)], indices
@@ -0,0 +1,80 @@
+import copy
+import torch
+from torch import nn
+from torch.ao.quantization import quantize_dynamic, get_default_qconfig_mapping
+from torch.ao.quantization.quantize_fx import prepare_fx, convert_fx
+from ai.model import DETR
+
+
+def default_engine():
+    """Pick the best quantized kernel backend available on this CPU."""
+    for engine in ('x86', 'fbgemm', 'qnnpack'):
+        if engine in torch.backends.quantized.supported_engines:
+            return engine
+    raise RuntimeError("No quantized engine available in this PyTorch build")
+
+
+def _backbone_body(model):
+    """ResNet-50 up to layer4 plus the 2048 -> hidden_dim projection."""
+    bb = model.backbone
+    return nn.Sequential(
+        bb.conv1, bb.bn1, bb.relu, bb.maxpool,
+        bb.layer1, bb.layer2, bb.layer3, bb.layer4,
+        model.conv,
+    )
+
+
+def quantize_detr(model, calibration_batches=(), engine=None):
+    """Convert an fp32 DETR into its INT8 CPU variant (in place).
+
+    The backbone convs and the projection conv use static post-training
+    quantization (FX graph mode, conv+bn+relu fused) calibrated on
+    ``calibration_batches``; the transformer and prediction heads use
+    dynamic INT8 quantization of their nn.Linear layers.
+    """
+    engine = engine or default_engine()
+    torch.backends.quantized.engine = engine
+    # Dynamically quantized Linear modules expose weight() as a method, which
+    # the fused nn.TransformerEncoderLayer fast path cannot handle.
+    if hasattr(torch.backends, 'mha'):
+        torch.backends.mha.set_fastpath_enabled(False)
+
+    model.eval()
+    body = copy.deepcopy(_backbone_body(model))
+    example_inputs = (torch.randn(1, 3, 224, 224),)
+    prepared = prepare_fx(body, get_default_qconfig_mapping(engine), example_inputs)
+
+    with torch.no_grad():
+        for batch in calibration_batches:
+            prepared(batch)
+
+    model.backbone_body = convert_fx(prepared)
+    # The fp32 modules now live (quantized) inside backbone_body
+    model.backbone = None
+    model.conv = None
+
+    quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8, inplace=True)
+    return model
+
+
+def save_quantized_detr(model, path, num_classes):
+    torch.save({
+        'format': 'detr-int8',
+        'engine': torch.backends.quantized.engine,
+        'num_classes': num_classes,
+        'state_dict': model.state_dict(),
+    }, path)
+
+
+def load_quantized_detr(path, num_classes=None, map_location='cpu'):
+    """Rebuild the INT8 module structure and load a saved INT8 checkpoint."""
+    checkpoint = torch.load(path, map_location=map_location)
+    if checkpoint.get('format') != 'detr-int8':
+        raise ValueError(f"{path} is not an INT8 DETR checkpoint")
+    num_classes = num_classes or checkpoint['num_classes']
+
+    # Convert an uncalibrated skeleton; the real scales/zero points come
+    # from the checkpoint's state dict.
+    model = quantize_detr(DETR(num_classes=num_classes, pretrained_backbone=False), engine=checkpoint['engine'])
+    model.load_state_dict(checkpoint['state_dict'])
+    return model
@@ -43,7 +43,8 @@ def create_app():
 
     mongo.init_app(app)
     bcrypt.init_app(app)
-    socketio.init_app(app, cors_allowed_origins=allowed_origins, supports_credentials=True)    
+    socketio.init_app(app, cors_allowed_origins=allowed_origins, supports_credentials=True,
+                      message_queue=app.config['SOCKETIO_MESSAGE_QUEUE'])    
     CORS(
         app,
         resources={r"/api/*": {"origins": allowed_origins}},
@@ -65,10 +66,22 @@ def create_app():
     from routes.socket_routes import register_socket_events
     register_socket_events()
 
+    from routes.metrics_routes import metrics_bp
+    app.register_blueprint(metrics_bp, url_prefix='/api/metrics')
+
+    from utils.model_manager import model_manager
+    if app.config['MODEL_PRELOAD']:
+        model_manager.start()
+
     @app.route('/api/test')
     def test_route():
         return jsonify({"message": "Flask backend is running!"})
 
+    @app.route('/api/ready')
+    def ready_route():
+        ready = model_manager.ready()
+        return jsonify({"ready": ready, "models": model_manager.status()}), 200 if ready else 503
+
     # Serve React Frontend
     @app.route('/')
     def index():
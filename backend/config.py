@@ -10,4 +10,106 @@ class Config:
 
     CLOUDINARY_CLOUD_NAME = os.environ.get('CLOUDINARY_CLOUD_NAME')
     CLOUDINARY_API_KEY = os.environ.get('CLOUDINARY_API_KEY')
-    CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
\ No newline at end of file
+    CLOUDINARY_API_SECRET = os.environ.get('CLOUDINARY_API_SECRET')
+
+    # Sign detection micro-batching (cross-session)
+    SIGN_BATCH_WINDOW_MS = int(os.environ.get('SIGN_BATCH_WINDOW_MS', 20))
+    SIGN_BATCH_MAX_SIZE = int(os.environ.get('SIGN_BATCH_MAX_SIZE', 16))
+    # Motion gate: mean gray-level change (0-255) below which a frame reuses the
+    # previous prediction; 0 disables it. MAX_SKIPS forces a re-run after N reuses.
+    SIGN_MOTION_THRESHOLD = float(os.environ.get('SIGN_MOTION_THRESHOLD', 3.0))
+    SIGN_MOTION_MAX_SKIPS = int(os.environ.get('SIGN_MOTION_MAX_SKIPS', 10))
+    # Out-of-process detection: number of worker processes (0 = run in the server process)
+    SIGN_WORKERS = int(os.environ.get('SIGN_WORKERS', 0))
+    SIGN_WORKER_THREADS = int(os.environ.get('SIGN_WORKER_THREADS', 0))  # 0 = cores / (server workers x sign workers)
+    SIGN_WORKER_SLOTS = int(os.environ.get('SIGN_WORKER_SLOTS', 2))  # ring buffer depth per worker
+
+    # Sign detection model
+    # 'fp32' (ai/29_model.pt) or 'int8' (quantized variant, see scripts/quantize_sign_model.py)
+    SIGN_MODEL_VARIANT = os.environ.get('SIGN_MODEL_VARIANT', 'fp32').lower()
+    SIGN_MODEL_INT8_PATH = os.environ.get('SIGN_MODEL_INT8_PATH')
+    # 'eager', 'torchscript' or 'onnx' (exports from scripts/export_sign_model.py)
+    SIGN_BACKEND = os.environ.get('SIGN_BACKEND', 'eager').lower()
+    SIGN_TORCHSCRIPT_PATH = os.environ.get('SIGN_TORCHSCRIPT_PATH')
+    SIGN_ONNX_PATH = os.environ.get('SIGN_ONNX_PATH')
+    SIGN_CHANNELS_LAST = os.environ.get('SIGN_CHANNELS_LAST', 'false').lower() == 'true'
+
+    # Model executor: per-model concurrency and wait-queue limits (see utils/executor.py)
+    MODEL_CONCURRENCY = {
+        'sign': int(os.environ.get('SIGN_CONCURRENCY', 1)),
+        'tts': int(os.environ.get('TTS_CONCURRENCY', 1)),
+        'stt': int(os.environ.get('STT_CONCURRENCY', 1)),
+        'decode': int(os.environ.get('DECODE_CONCURRENCY', 2)),  # ffmpeg audio decoding
+    }
+    MODEL_QUEUE_LIMIT = {
+        'sign': int(os.environ.get('SIGN_QUEUE_LIMIT', 4)),
+        'tts': int(os.environ.get('TTS_QUEUE_LIMIT', 32)),
+        'stt': int(os.environ.get('STT_QUEUE_LIMIT', 16)),
+        'decode': int(os.environ.get('DECODE_QUEUE_LIMIT', 32)),
+    }
+
+    # Load all models in parallel in the background at startup; when false each
+    # model loads on first use. /api/ready reports progress either way.
+    MODEL_PRELOAD = os.environ.get('MODEL_PRELOAD', 'true').lower() == 'true'
+
+    # Folder of mmap-able weight exports (scripts/export_mmap_weights.py); worker
+    # processes on one host then share the weight pages instead of copying them
+    MODEL_WEIGHTS_DIR = os.environ.get('MODEL_WEIGHTS_DIR')
+
+    # TTS audio cache: in-memory LRU size and on-disk folder ('' disables the disk tier)
+    TTS_CACHE_MEMORY_MB = int(os.environ.get('TTS_CACHE_MEMORY_MB', 64))
+    TTS_CACHE_DIR = os.environ.get('TTS_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cache', 'tts'))
+    # Only sign labels and these '|'-separated phrases are written to disk (typed
+    # free text stays in memory); the disk tier is an LRU capped at DISK_MB
+    TTS_CACHE_DISK_MB = int(os.environ.get('TTS_CACHE_DISK_MB', 256))
+    TTS_CACHE_DISK_PHRASES = [phrase for phrase in os.environ.get('TTS_CACHE_DISK_PHRASES', '').split('|') if phrase.strip()]
+    # TTS voices: x-vector bundle from scripts/export_speakers.py, and its default voice
+    TTS_SPEAKERS_PATH = os.environ.get('TTS_SPEAKERS_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ai', 'tts_speakers.npz'))
+    TTS_DEFAULT_VOICE = os.environ.get('TTS_DEFAULT_VOICE', 'default')
+    # 'fp32' or 'optimized' (dynamic INT8 SpeechT5 + bf16 vocoder on CPUs with bf16 support)
+    TTS_PRECISION = os.environ.get('TTS_PRECISION', 'fp32').lower()
+    # TTS batching: requests arriving within the window are synthesized together
+    TTS_BATCH_WINDOW_MS = int(os.environ.get('TTS_BATCH_WINDOW_MS', 30))
+    TTS_BATCH_MAX_SIZE = int(os.environ.get('TTS_BATCH_MAX_SIZE', 8))
+    # Audio sent to clients: 'wav' (16-bit PCM) or 'ogg' (Opus, or Vorbis, when
+    # libsndfile supports it; falls back to wav)
+    TTS_AUDIO_FORMAT = os.environ.get('TTS_AUDIO_FORMAT', 'wav').lower()
+    # Typed text is synthesized and sent phrase by phrase (play-audio-message
+    # carries stream_id/seq/final); phrases are cut at sentence ends, then commas
+    TTS_STREAMING = os.environ.get('TTS_STREAMING', 'true').lower() == 'true'
+    TTS_CHUNK_MAX_CHARS = int(os.environ.get('TTS_CHUNK_MAX_CHARS', 100))
+
+    # Streaming STT (stt-audio-chunk): partial caption every INTERVAL of new audio,
+    # final caption after SILENCE of quiet (RMS below ENERGY_THRESHOLD) or MAX_WINDOW
+    STT_STREAM_INTERVAL_MS = int(os.environ.get('STT_STREAM_INTERVAL_MS', 1000))
+    STT_STREAM_SILENCE_MS = int(os.environ.get('STT_STREAM_SILENCE_MS', 700))
+    STT_STREAM_MAX_WINDOW_S = float(os.environ.get('STT_STREAM_MAX_WINDOW_S', 10))
+    STT_STREAM_ENERGY_THRESHOLD = float(os.environ.get('STT_STREAM_ENERGY_THRESHOLD', 0.01))
+
+    # STT engine: 'whisper' (openai-whisper), 'whisper-int8' (dynamic INT8 Linear
+    # layers, CPU) or 'faster-whisper' (CTranslate2, needs faster-whisper installed);
+    # compute type only applies to faster-whisper
+    STT_ENGINE = os.environ.get('STT_ENGINE', 'whisper').lower()
+    STT_MODEL = os.environ.get('STT_MODEL', 'base')
+    STT_COMPUTE_TYPE = os.environ.get('STT_COMPUTE_TYPE', 'int8')
+    # STT batching: clips arriving within the window share one encoder pass and
+    # batched greedy decoding
+    STT_BATCH_WINDOW_MS = int(os.environ.get('STT_BATCH_WINDOW_MS', 20))
+    STT_BATCH_MAX_SIZE = int(os.environ.get('STT_BATCH_MAX_SIZE', 8))
+
+    # Server-side VAD before Whisper: trims silence, splits clips longer than
+    # MAX_CLIP_S at pauses, and rejects clips without speech
+    STT_VAD = os.environ.get('STT_VAD', 'true').lower() == 'true'
+    STT_VAD_THRESHOLD_DB = float(os.environ.get('STT_VAD_THRESHOLD_DB', -45))
+    STT_VAD_MIN_SPEECH_MS = int(os.environ.get('STT_VAD_MIN_SPEECH_MS', 250))
+    STT_VAD_MIN_SILENCE_MS = int(os.environ.get('STT_VAD_MIN_SILENCE_MS', 500))
+    STT_VAD_PADDING_MS = int(os.environ.get('STT_VAD_PADDING_MS', 200))
+    STT_VAD_MAX_CLIP_S = float(os.environ.get('STT_VAD_MAX_CLIP_S', 25))
+
+    # Preforking launcher (serve.py): worker processes forked after the models
+    # are loaded, and torch intra-op threads per worker (0 = cores / workers).
+    SERVER_WORKERS = int(os.environ.get('SERVER_WORKERS', 1))
+    SERVER_WORKER_THREADS = int(os.environ.get('SERVER_WORKER_THREADS', 0))
+    # Socket.IO message queue (e.g. redis://localhost:6379/0) so emits reach
+    # sockets held by other workers; required when SERVER_WORKERS > 1
+    SOCKETIO_MESSAGE_QUEUE = os.environ.get('SOCKETIO_MESSAGE_QUEUE')
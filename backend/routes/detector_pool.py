@@ -0,0 +1,265 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from multiprocessing import shared_memory
+import numpy as np
+import torch
+from extensions import socketio
+from config import Config
+from ai.preprocess import FramePreprocessor
+
+FRAME_SIZE = 224
+
+# The pipe readers are native threads even if eventlet monkey-patches the
+# stdlib, and hand results over through native (thread-safe) queues
+try:
+    from eventlet import patcher
+    _native_threading = patcher.original('threading')
+    _native_queue = patcher.original('queue')
+except ImportError:
+    import queue as _native_queue
+    _native_threading = threading
+
+
+def _worker_main(shm_name, ring_shape, conn, threads):
+    """Worker process: owns one SignDetector and serves batches from its ring."""
+    torch.set_num_threads(threads)
+    from routes.sign_detector import SignDetector
+
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray(ring_shape, dtype=np.float32, buffer=shm.buf)
+
+    detector = SignDetector()
+    if detector.backend is not None:
+        detector.warmup()
+    conn.send(('ready', None, detector.backend is not None))
+
+    try:
+        while True:
+            message = conn.recv()
+            if message is None: break
+
+            slot, count = message
+            try:
+                labels = detector.predict_tensor(torch.from_numpy(ring[slot, :count]))
+            except Exception as e:
+                print(f"Prediction Error (worker {os.getpid()}): {e}")
+                labels = [None] * count
+            conn.send(('result', slot, labels))
+    finally:
+        del ring
+        shm.close()
+
+
+class _Worker:
+    def __init__(self, ctx, ring_shape, threads):
+        nbytes = int(np.prod(ring_shape)) * np.dtype(np.float32).itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=nbytes)
+        self.ring = np.ndarray(ring_shape, dtype=np.float32, buffer=self.shm.buf)
+
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(self.shm.name, ring_shape, child_conn, threads),
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+        self.ready = False
+        self.alive = True
+        self.slots = ring_shape[0]
+        # slot -> native queue the waiting caller blocks on for that slot's labels
+        self.waiters = {}
+
+
+class SignWorkerPool:
+    """Sign detection in a pool of worker processes, each holding the model.
+
+    Mirrors the SignDetector batch API (decode_frame / predict_frames /
+    predict_batch) so FrameBatcher can use either. Frames are decoded and
+    normalized in the server process and written straight into a per-worker
+    shared-memory ring of (max_batch_size, 3, 224, 224) float32 slots; only
+    the slot index and the resulting labels cross the pipe.
+
+    One native reader thread per worker blocks on its pipe and hands each
+    result to the caller waiting on that slot through a thread-safe queue;
+    free slots are handed out through another one. Under eventlet callers
+    wait on those queues through ``tpool`` (like the model executor), so
+    they sleep until their result arrives, nothing touches a hub from
+    another thread, and signaling keeps flowing while every core runs
+    inference. ``load()`` may run on any thread: the readers don't need
+    the event loop to report the workers ready.
+    """
+    out_of_process = True
+
+    def __init__(self, workers=Config.SIGN_WORKERS, threads=Config.SIGN_WORKER_THREADS,
+                 slots_per_worker=Config.SIGN_WORKER_SLOTS,
+                 max_batch_size=Config.SIGN_BATCH_MAX_SIZE):
+        self.num_workers = max(1, workers)
+        # 0 = this process's share of the cores, worked out in start()
+        self.threads = threads
+        self.slots_per_worker = max(1, slots_per_worker)
+        self.max_batch_size = max(1, max_batch_size)
+        # one in-flight batch per ring slot
+        self.concurrency = self.num_workers * self.slots_per_worker
+
+        self.preprocessor = FramePreprocessor(size=FRAME_SIZE, max_batch_size=1)
+        # the preprocessor's resize scratch buffer is shared by in-flight batches
+        self._preprocess_lock = threading.Lock()
+        self.workers = []
+        # (worker, slot) tokens of free ring slots; (None, None) wakes waiters
+        # once no worker is left
+        self._free = _native_queue.Queue()
+        # set once a worker has its model loaded, or every worker failed
+        self._settled = _native_threading.Event()
+        self._reported = 0
+        self._report_lock = _native_threading.Lock()
+
+    def load(self):
+        """Start the workers and block until at least one has its model loaded."""
+        self.start()
+        self._settled.wait()
+        if not any(worker.ready for worker in self.workers):
+            raise RuntimeError("no sign detection worker could load the model")
+        return self
+
+    def start(self):
+        if self.workers: return
+
+        ring_shape = (self.slots_per_worker, self.max_batch_size, 3, FRAME_SIZE, FRAME_SIZE)
+        ctx = multiprocessing.get_context('spawn')
+        if not self.threads:
+            # Every server worker (serve.py) starts its own pool: split the
+            # cores between all of their detector processes
+            processes = max(1, Config.SERVER_WORKERS) * self.num_workers
+            self.threads = max(1, (os.cpu_count() or 1) // processes)
+        print(f"🔄 Starting {self.num_workers} sign detection workers ({self.threads} threads each)...")
+        self.workers = [_Worker(ctx, ring_shape, self.threads) for _ in range(self.num_workers)]
+        for worker in self.workers:
+            _native_threading.Thread(target=self._read, args=(worker,),
+                                     name=f"sign-reader-{worker.process.pid}", daemon=True).start()
+        atexit.register(self.shutdown)
+
+    def _eventlet(self):
+        return getattr(socketio, 'async_mode', None) == 'eventlet'
+
+    def _block(self, fn, *args):
+        # A blocking wait on a native queue: in eventlet's thread pool so the
+        # event loop keeps running, directly on a real thread otherwise
+        if self._eventlet():
+            from eventlet import tpool
+            return tpool.execute(fn, *args)
+        return fn(*args)
+
+    def _read(self, worker):
+        """Reader thread of one worker: dispatches its messages until it exits."""
+        reported = False
+        while True:
+            try:
+                kind, slot, payload = worker.conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if kind == 'ready':
+                reported = True
+                worker.ready = payload
+                if payload:
+                    for slot in range(worker.slots):
+                        self._free.put((worker, slot))
+                    self._settled.set()
+                else:
+                    print(f"❌ Sign worker {worker.process.pid} failed to load the model")
+                self._report()
+            else:
+                waiter = worker.waiters.pop(slot, None)
+                if waiter is not None: waiter.put(payload)
+
+        worker.alive = False
+        worker.ready = False
+        print(f"❌ Sign worker {worker.process.pid} exited")
+        for waiter in list(worker.waiters.values()):
+            waiter.put(None)
+        worker.waiters.clear()
+        if not reported:
+            self._report()
+        if not any(other.ready for other in self.workers):
+            for _ in range(self.concurrency):
+                self._free.put((None, None))
+
+    def _report(self):
+        with self._report_lock:
+            self._reported += 1
+            if self._reported >= len(self.workers):
+                self._settled.set()
+
+    def shutdown(self):
+        for worker in self.workers:
+            try:
+                if worker.alive: worker.conn.send(None)
+                worker.process.join(timeout=5)
+            except Exception:
+                pass
+            worker.ring = None
+            worker.shm.close()
+            worker.shm.unlink()
+        self.workers = []
+
+    def decode_frame(self, image_data):
+        return self.preprocessor.decode(image_data)
+
+    def predict_batch(self, images):
+        frames = []
+        for image in images:
+            try:
+                frames.append(self.decode_frame(image))
+            except Exception as e:
+                print(f"Prediction Error: {e}")
+                frames.append(None)
+        return self.predict_frames(frames)
+
+    def predict_frames(self, frames):
+        labels = []
+        for i in range(0, len(frames), self.max_batch_size):
+            labels.extend(self._predict_chunk(frames[i:i + self.max_batch_size]))
+        return labels
+
+    def _acquire_slot(self):
+        # Free slots come back in release order, which spreads the load
+        while True:
+            if not any(worker.ready for worker in self.workers):
+                return None, None  # models still loading, or every worker exited
+            worker, slot = self._block(self._free.get)
+            if worker is not None and worker.ready:
+                return worker, slot
+            # a slot of a worker that exited since, or the no-worker wake-up
+
+    def _predict_chunk(self, frames):
+        labels = [None] * len(frames)
+
+        worker, slot = self._acquire_slot()
+        if worker is None: return labels
+
+        try:
+            with self._preprocess_lock:
+                _, indices = self.preprocessor(frames, out=worker.ring[slot])
+            if not indices: return labels
+
+            waiter = worker.waiters[slot] = _native_queue.Queue()
+            if not worker.alive:
+                raise RuntimeError(f"sign worker {worker.process.pid} died")
+            worker.conn.send((slot, len(indices)))
+            results = self._block(waiter.get)
+            if results is None:
+                raise RuntimeError(f"sign worker {worker.process.pid} died")
+            for i, label in zip(indices, results):
+                labels[i] = label
+        except Exception as e:
+            print(f"Prediction Error: {e}")
+        finally:
+            worker.waiters.pop(slot, None)
+            if worker.ready:
+                self._free.put((worker, slot))
+
+        return labels
@@ -0,0 +1,209 @@
+import time
+import threading
+from extensions import socketio
+from config import Config
+from utils.executor import model_executor
+from utils.model_manager import model_manager
+
+
+class FrameBatcher:
+    """Cross-session micro-batching in front of the sign detector.
+
+    Frames from every active socket are collected for a short window (or
+    until ``max_batch_size`` sockets are waiting), stacked into one tensor and
+    run through a single forward pass. Each label is then handed back to
+    ``on_result(sid, target_user_id, label)`` for the socket it came from,
+    in a background task of its own (delivery may wait on TTS).
+
+    Every socket owns a single frame slot: a frame that arrives before the
+    previous one was picked up replaces it (latest frame wins), so detection
+    latency stays bounded when the node cannot keep up with 2 fps per caller.
+
+    With a ``motion_gate`` frames whose scene has not changed since the last
+    detection reuse that socket's previous label instead of entering the batch.
+
+    Up to ``detector.concurrency`` batches are in flight at once (one for the
+    in-process SignDetector, one per ring slot for SignWorkerPool); the next
+    batch is only collected once capacity frees up, so slots keep absorbing
+    newer frames meanwhile.
+    """
+
+    def __init__(self, detector, on_result, motion_gate=None,
+                 window_ms=Config.SIGN_BATCH_WINDOW_MS,
+                 max_batch_size=Config.SIGN_BATCH_MAX_SIZE):
+        self.detector = detector
+        self.on_result = on_result
+        self.motion_gate = motion_gate
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self._queue = None
+        self._empty = None
+        self._capacity = None
+        # sid -> (target_user_id, image_data, submitted_at)
+        self._slots = {}
+        self._lock = threading.Lock()
+
+        self._stats = {
+            "frames_received": 0,
+            "frames_dropped": 0,
+            "frames_processed": 0,
+            "batches": 0,
+            "staleness_ms_total": 0.0,
+            "staleness_ms_max": 0.0,
+        }
+
+    def start(self):
+        """Start the background batching loop (idempotent)."""
+        if self._queue is not None: return
+
+        # Use the queue flavour of the running async mode (eventlet/threading)
+        eio = socketio.server.eio
+        self._queue = eio.create_queue()
+        self._empty = eio.get_queue_empty_exception()
+        self._capacity = eio.create_queue()
+        for _ in range(self._capacity_total()):
+            self._capacity.put(None)
+        socketio.start_background_task(self._run)
+
+    def submit(self, sid, target_user_id, image_data):
+        self.start()
+        if self.motion_gate is not None:
+            self.motion_gate.add(sid)
+
+        with self._lock:
+            self._stats["frames_received"] += 1
+            superseded = sid in self._slots
+            self._slots[sid] = (target_user_id, image_data, time.monotonic())
+            if superseded:
+                self._stats["frames_dropped"] += 1
+
+        # The socket already has a wake-up queued for its slot
+        if not superseded:
+            self._queue.put(sid)
+
+    def discard(self, sid):
+        """Forget any unprocessed frame of a disconnected socket."""
+        with self._lock:
+            self._slots.pop(sid, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["pending"] = len(self._slots)
+
+        processed = stats["frames_processed"]
+        stats["staleness_ms_avg"] = round(stats.pop("staleness_ms_total") / processed, 2) if processed else 0.0
+        stats["staleness_ms_max"] = round(stats["staleness_ms_max"], 2)
+        stats["avg_batch_size"] = round(processed / stats["batches"], 2) if stats["batches"] else 0.0
+        return stats
+
+    def _collect(self):
+        # Block for the first ready socket, then keep gathering until the
+        # window closes or the batch is full.
+        sids = [self._queue.get()]
+        deadline = time.monotonic() + self.window
+
+        while len(sids) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            try:
+                sids.append(self._queue.get(timeout=remaining))
+            except self._empty:
+                break
+
+        # Take the newest frame of each slot only now, so frames that arrived
+        # during the window still win over older ones.
+        batch = []
+        now = time.monotonic()
+        with self._lock:
+            for sid in sids:
+                slot = self._slots.pop(sid, None)
+                if slot is None: continue
+                target_user_id, image_data, submitted_at = slot
+                batch.append((sid, target_user_id, image_data))
+
+                staleness_ms = (now - submitted_at) * 1000.0
+                self._stats["staleness_ms_total"] += staleness_ms
+                self._stats["staleness_ms_max"] = max(self._stats["staleness_ms_max"], staleness_ms)
+
+            if batch:
+                self._stats["frames_processed"] += len(batch)
+                self._stats["batches"] += 1
+
+        return batch
+
+    def _predict(self, batch):
+        images = [image for _, _, image in batch]
+        if not self.motion_gate or not self.motion_gate.enabled:
+            return self.detector.predict_batch(images)
+
+        labels = [None] * len(batch)
+        pending = []  # (index, frame, thumbnail) that need the model
+
+        for i, ((sid, _, _), image) in enumerate(zip(batch, images)):
+            try:
+                frame = self.detector.decode_frame(image)
+            except Exception as e:
+                print(f"Prediction Error: {e}")
+                frame = None
+            if frame is None: continue
+
+            thumbnail = self.motion_gate.thumbnail(frame)
+            unchanged, previous_label = self.motion_gate.check(sid, thumbnail)
+            if unchanged:
+                labels[i] = previous_label
+            else:
+                pending.append((i, frame, thumbnail))
+
+        if pending:
+            results = self.detector.predict_frames([frame for _, frame, _ in pending])
+            for (i, _, thumbnail), label in zip(pending, results):
+                self.motion_gate.update(batch[i][0], thumbnail, label)
+                labels[i] = label
+
+        return labels
+
+    def _process(self, batch):
+        try:
+            if not model_manager.is_ready('sign'):
+                # Still loading (or first frame with lazy loading): drop the
+                # batch rather than hold frames that will be stale anyway.
+                model_manager.start('sign')
+                labels = [None] * len(batch)
+            elif getattr(self.detector, 'out_of_process', False):
+                # The pool already waits cooperatively on its workers
+                labels = self._predict(batch)
+            else:
+                labels = model_executor.run('sign', self._predict, batch)
+        except Exception as e:
+            print(f"Prediction Error: {e}")
+            labels = [None] * len(batch)
+        finally:
+            self._capacity.put(None)
+
+        # Delivery may wait on TTS synthesis; never let it hold up the next batch
+        for (sid, target_user_id, _), label in zip(batch, labels):
+            socketio.start_background_task(self._deliver, sid, target_user_id, label)
+
+    def _deliver(self, sid, target_user_id, label):
+        try:
+            self.on_result(sid, target_user_id, label)
+        except Exception as e:
+            print(f"❌ Error delivering sign prediction to {sid}: {e}")
+
+    def _run(self):
+        while True:
+            self._capacity.get()
+            batch = self._collect()
+            if not batch:
+                self._capacity.put(None)
+                continue
+
+            if self._capacity_total() == 1:
+                self._process(batch)
+            else:
+                socketio.start_background_task(self._process, batch)
+
+    def _capacity_total(self):
+        return max(1, getattr(self.detector, 'concurrency', 1))
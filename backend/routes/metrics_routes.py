@@ -0,0 +1,21 @@
+from flask import Blueprint, jsonify
+from routes.socket_routes import frame_batcher, motion_gate, stt_streamer
+from routes.tts import tts_cache, tts_batcher
+from routes.stt_routes import vad, stt_batcher
+from utils.executor import model_executor
+
+metrics_bp = Blueprint('metrics_bp', __name__)
+
+
+@metrics_bp.route('', methods=['GET'])
+def get_metrics():
+    return jsonify({
+        'sign_frames': frame_batcher.stats(),
+        'sign_motion_gate': motion_gate.stats(),
+        'tts_cache': tts_cache.stats(),
+        'tts_batcher': tts_batcher.stats(),
+        'stt_stream': stt_streamer.stats(),
+        'stt_vad': vad.stats(),
+        'stt_batcher': stt_batcher.stats(),
+        'executor': model_executor.stats(),
+    }), 200
@@ -0,0 +1,78 @@
+import threading
+import cv2
+import numpy as np
+from config import Config
+
+
+class MotionGate:
+    """Per-socket change detector that lets unchanged frames skip the model.
+
+    Each frame is reduced to a small grayscale thumbnail and compared with the
+    thumbnail of the last frame that actually went through the detector. If
+    the mean absolute difference stays below ``threshold`` (in 0-255 gray
+    levels) the previous prediction is reused. After ``max_skips`` reuses in a
+    row the model runs anyway, so a slow drift cannot hide a new sign forever.
+
+    Sockets are tracked from ``add(sid)`` until ``discard(sid)``; updates for
+    any other sid (a batch finishing after its socket disconnected) are
+    ignored, so no state outlives its socket.
+    """
+
+    def __init__(self, threshold=Config.SIGN_MOTION_THRESHOLD,
+                 max_skips=Config.SIGN_MOTION_MAX_SKIPS, size=32):
+        self.threshold = threshold
+        self.max_skips = max_skips
+        self.size = size
+
+        # sid -> {"thumbnail", "label", "skips"} (thumbnail None until the first update)
+        self._state = {}
+        self._lock = threading.Lock()
+        self._stats = {"frames_checked": 0, "frames_skipped": 0}
+
+    @property
+    def enabled(self):
+        return self.threshold > 0
+
+    def thumbnail(self, frame):
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        return cv2.resize(gray, (self.size, self.size), interpolation=cv2.INTER_AREA)
+
+    def check(self, sid, thumbnail):
+        """Return (unchanged, previous_label) for a socket's new frame."""
+        with self._lock:
+            self._stats["frames_checked"] += 1
+            state = self._state.get(sid)
+            if state is None or state["thumbnail"] is None or state["skips"] >= self.max_skips:
+                return False, None
+
+            motion = float(np.mean(cv2.absdiff(thumbnail, state["thumbnail"])))
+            if motion >= self.threshold:
+                return False, None
+
+            state["skips"] += 1
+            self._stats["frames_skipped"] += 1
+            return True, state["label"]
+
+    def add(self, sid):
+        """Start tracking a socket (idempotent)."""
+        with self._lock:
+            self._state.setdefault(sid, {"thumbnail": None, "label": None, "skips": 0})
+
+    def update(self, sid, thumbnail, label):
+        """Remember the frame the model just ran on and its prediction."""
+        with self._lock:
+            if sid not in self._state: return  # discarded meanwhile
+            self._state[sid] = {"thumbnail": thumbnail, "label": label, "skips": 0}
+
+    def discard(self, sid):
+        with self._lock:
+            self._state.pop(sid, None)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["sockets"] = len(self._state)
+
+        checked = stats["frames_checked"]
+        stats["skip_rate"] = round(stats["frames_skipped"] / checked, 4) if checked else 0.0
+        return stats
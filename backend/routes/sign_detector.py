@@ -1,11 +1,10 @@
 import torch
-import cv2
 import numpy as np
-import base64
 import sys
 import os
-import albumentations as A
-from albumentations.pytorch import ToTensorV2
+from config import Config
+from utils.model_manager import model_manager
+from utils.weights import load_state_dict_mmap
 
 
 
@@ -15,99 +14,180 @@ ai_folder = os.path.join(os.path.dirname(current_dir), 'ai')
 
 try:
     from ai.model import DETR
+    from ai.preprocess import FramePreprocessor
+    from ai.quantization import load_quantized_detr
+    from ai.backends import EagerBackend, TorchScriptBackend, OnnxRuntimeBackend
     from ai.utils.setup import get_classes
 except ImportError as e:
     print(f"❌ Error importing AI model files: {e}")
     print(f"   Ensure 'model.py' and 'utils/' are inside '{ai_folder}'")
     DETR = None
 
+# Labels of the 11-class model (also pre-rendered by the TTS cache)
+SIGN_CLASSES = ["break","book","congratulations","goodmorning","hello","home","iloveyou","mistake","please","quiet","thankyou"]
+
 class SignDetector:
-    def __init__(self):
+    # predict_* share one preprocessing buffer, so run one batch at a time
+    concurrency = 1
+
+    def __init__(self, load=True):
         self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')
         self.model = None
+        self.backend = None
         self.classes = []
-        self.transform = None
+        self.preprocessor = None
         
         
         self.model_path = os.path.join(ai_folder, '29_model.pt')
+        self.int8_model_path = Config.SIGN_MODEL_INT8_PATH or os.path.join(ai_folder, '29_model_int8.pt')
+        self.variant = Config.SIGN_MODEL_VARIANT
+        self.backend_name = Config.SIGN_BACKEND
+        self.torchscript_path = Config.SIGN_TORCHSCRIPT_PATH or os.path.join(ai_folder, '29_model.ts')
+        self.onnx_path = Config.SIGN_ONNX_PATH or os.path.join(ai_folder, '29_model.onnx')
 
-        self.load_model()
+        if load:
+            self.load_model()
 
     def load_model(self):
         if not DETR: return
 
-        print(f"🔄 Loading Sign Language Model from {self.model_path}...")
+        print(f"🔄 Loading Sign Language Model ({self.backend_name} backend)...")
         try:
-            # 1. Initialize Model 
-            # Update this number if your 99_model.pt has more classes!
-            self.model = DETR(num_classes=11) 
-            self.model.eval()
-            
-            # 2. Load Weights
-            checkpoint = torch.load(self.model_path, map_location=self.device)
-            self.model.load_state_dict(checkpoint)
-            self.model.to(self.device)
+            # 1-2. Initialize the inference backend
+            if self.backend_name == 'torchscript':
+                self.device = torch.device('cpu')
+                self.backend = TorchScriptBackend(self.torchscript_path)
+            elif self.backend_name == 'onnx':
+                self.device = torch.device('cpu')
+                self.backend = OnnxRuntimeBackend(self.onnx_path)
+            else:
+                self.model = self._load_eager_model()
+                self.backend = EagerBackend(self.model)
             
             # 3. Setup Classes
             # try:
             #     self.classes = get_classes()
             # except:
             #     self.classes = ['Class1', 'Class2', 'Class3'] 
-            self.classes = ["break","book","congratulations","goodmorning","hello","home","iloveyou","mistake","please","quiet","thankyou"]
-
-            # 4. Setup Transforms (Standard for DETR)
-            self.transform = A.Compose([
-                A.Resize(224, 224),
-                A.Normalize(mean=[0.485, 0.456, 0.406], std=[0.229, 0.224, 0.225]),
-                ToTensorV2()
-            ])
+            self.classes = list(SIGN_CLASSES)
+
+            # 4. Setup Preprocessing (fused Resize + Normalize, reusable batch buffer)
+            self.preprocessor = FramePreprocessor(size=224, max_batch_size=Config.SIGN_BATCH_MAX_SIZE)
             
             print("✅ Sign Language Model Loaded Successfully")
         except Exception as e:
+            self.backend = None
             print(f"❌ Failed to load model: {e}")
 
-    def predict(self, base64_image):
-        if not self.model: return None
+    def _load_eager_model(self):
+        if self.variant == 'int8':
+            # Quantized CPU variant (structure + INT8 weights)
+            print(f"   INT8 weights: {self.int8_model_path}")
+            self.device = torch.device('cpu')
+            model = load_quantized_detr(self.int8_model_path, num_classes=11)
+            return model.enable_inference_mode()
+
+        print(f"   fp32 weights: {self.model_path}")
+        # Update this number if your 99_model.pt has more classes!
+        model = DETR(num_classes=11, pretrained_backbone=False)
+        model.eval()
+        
+        if self.device.type == 'cpu':
+            # Shared, copy-on-write pages across worker processes
+            load_state_dict_mmap(model, self.model_path)
+        else:
+            checkpoint = torch.load(self.model_path, map_location=self.device)
+            model.load_state_dict(checkpoint)
+        model.to(self.device)
+        return model.enable_inference_mode(channels_last=Config.SIGN_CHANNELS_LAST)
+
+    def warmup(self):
+        """Run one blank frame through the whole pipeline to prime kernels and caches."""
+        self.predict_frames([np.zeros((240, 320, 3), dtype=np.uint8)])
+
+    def decode_frame(self, image_data):
+        """Decode a JPEG frame to a BGR image.
+
+        Binary Socket.IO attachments (bytes) are decoded in place; base64
+        data URLs from older clients are still accepted.
+        """
+        if not self.preprocessor: return None
+        return self.preprocessor.decode(image_data)
+
+    def postprocess(self, logits):
+        """Map the (num_queries, num_classes + 1) logits of one frame to a label."""
+        probabilities = logits.softmax(-1)[:, :-1]
+        max_probs, max_classes = probabilities.max(-1)
+
+        # Confidence Threshold 0.8
+        keep_mask = max_probs > 0.8
+
+        if keep_mask.any():
+            best_idx = max_probs.argmax()
+            if max_probs[best_idx] > 0.8:
+                class_id = max_classes[best_idx].item()
+                # Safety check for class index
+                if class_id < len(self.classes):
+                    return self.classes[class_id]
+
+        return None
+
+    def predict_batch(self, images):
+        """Run a single forward pass over several encoded frames.
+
+        Returns one label (or None) per input frame, in the same order.
+        """
+        if not self.backend or not images: return [None] * len(images)
+
+        frames = []
+        for image in images:
+            try:
+                frames.append(self.decode_frame(image))
+            except Exception as e:
+                print(f"Prediction Error: {e}")
+                frames.append(None)
+
+        return self.predict_frames(frames)
+
+    def predict_frames(self, frames):
+        """Like predict_batch, for frames already decoded with decode_frame."""
+        labels = [None] * len(frames)
+        if not self.backend or not frames: return labels
 
         try:
-            # Decode Base64 -> OpenCV Image
-            if "base64," in base64_image:
-                base64_image = base64_image.split("base64,")[1]
-            image_bytes = base64.b64decode(base64_image)
-            np_arr = np.frombuffer(image_bytes, np.uint8)
-            frame = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
-
-            if frame is None: return None
-
-            # Preprocess
-            frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            transformed = self.transform(image=frame_rgb)
-            img_tensor = transformed['image'].unsqueeze(0).to(self.device)
-
-            # Inference
-            with torch.no_grad():
-                result = self.model(img_tensor)
-
-            # Post-Processing
-            probabilities = result['pred_logits'].softmax(-1)[0, :, :-1]
-            max_probs, max_classes = probabilities.max(-1)
-            
-            # Confidence Threshold 0.8
-            keep_mask = max_probs > 0.8
-            
-            if keep_mask.any():
-                best_idx = max_probs.argmax()
-                if max_probs[best_idx] > 0.8:
-                    class_id = max_classes[best_idx].item()
-                    # Safety check for class index
-                    if class_id < len(self.classes):
-                        return self.classes[class_id]
-            
-            return None
+            batch, indices = self.preprocessor(frames)
+            if not indices: return labels
+
+            for i, label in zip(indices, self.predict_tensor(batch)):
+                labels[i] = label
 
         except Exception as e:
             print(f"Prediction Error: {e}")
-            return None
 
-# Singleton Instance
-detector = SignDetector()
\ No newline at end of file
+        return labels
+
+    def predict_tensor(self, batch):
+        """Labels for an already preprocessed (N, 3, 224, 224) batch."""
+        batch = batch.to(self.device)
+
+        # Inference (only the class logits are needed, skip the box head)
+        logits = self.backend(batch)
+
+        # Post-Processing
+        return [self.postprocess(logits[row]) for row in range(logits.shape[0])]
+
+    def predict(self, image_data):
+        return self.predict_batch([image_data])[0]
+
+def _load_detector():
+    detector.load_model()
+    if detector.backend is None:
+        raise RuntimeError("sign language model did not load (see log above)")
+    return detector
+
+# Singleton Instance (worker processes own the model when SIGN_WORKERS > 0).
+# Loaded by the model manager, in the background or on first use.
+detector = None
+if Config.SIGN_WORKERS == 0:
+    detector = SignDetector(load=False)
+    model_manager.register('sign', _load_detector, warmup=SignDetector.warmup)
@@ -2,19 +2,57 @@ from flask import request
 from flask_socketio import emit, join_room, leave_room
 from extensions import socketio, mongo  
 import datetime
+import uuid
 from bson.objectid import ObjectId
-from routes.tts import get_tts_audio
+from routes.tts import get_tts_audio, stream_tts_audio, tts_batcher, list_voices, resolve_voice, AUDIO_MIME, PRIORITY_SIGN
 from routes.sign_detector import detector
+from routes.detector_pool import SignWorkerPool
+from routes.frame_batcher import FrameBatcher
+from routes.motion_gate import MotionGate
+from routes.stt_stream import SttStreamer
+from utils.model_manager import model_manager
+from utils.micro_batcher import JobGroup, JobCancelled
 
 online_users = {}
+# sids of the sockets currently connected (late batch results check this)
+connected_sids = set()
 # Prevent repeated TTS for same sign
 last_sign_spoken = {}
 SIGN_COOLDOWN_SECONDS = 10
+# user_id -> chosen TTS voice (in memory; falls back to the default voice)
+voice_preferences = {}
+# sid -> JobGroup of the TTS jobs that socket requested during its current call
+tts_groups = {}
+
+
+def tts_group(sid):
+    group = tts_groups.get(sid)
+    if group is None:
+        group = tts_groups[sid] = JobGroup(sid)
+    return group
+
+
+def voice_for(sid):
+    """TTS voice of the user connected on ``sid``."""
+    for user_id, user_data in online_users.items():
+        if user_data.get('socket_id') == sid:
+            return voice_preferences.get(user_id)
+    return None
+
+
+def cancel_tts(sid):
+    """Drop the socket's pending TTS; the next request starts a new group."""
+    group = tts_groups.pop(sid, None)
+    if group is not None:
+        cancelled = tts_batcher.cancel(group)
+        if cancelled:
+            print(f"🛑 Cancelled {cancelled} pending TTS jobs of {sid}")
 
 def register_socket_events():
     
     @socketio.on('connect')
     def handle_connect():
+        connected_sids.add(request.sid)
         print(f"Client connected with socket_id: {request.sid}")
 
     @socketio.on('user_online')
@@ -30,6 +68,7 @@ def register_socket_events():
 
     @socketio.on('disconnect')
     def handle_disconnect():
+        connected_sids.discard(request.sid)
         user_id_to_remove = None
         for user_id, user_data in online_users.items():
             if user_data['socket_id'] == request.sid:
@@ -46,6 +85,11 @@ def register_socket_events():
         for k in keys_to_remove:
             del last_sign_spoken[k]
 
+        frame_batcher.discard(request.sid)
+        motion_gate.discard(request.sid)
+        cancel_tts(request.sid)
+        stt_streamer.discard(request.sid)
+
         print(f"Client disconnected: {request.sid}")
     
     @socketio.on('get_online_users')
@@ -131,8 +175,11 @@ def register_socket_events():
     @socketio.on('call-ended')
     def handle_call_ended(data):
         target_user_id = data.get('to')
+        cancel_tts(request.sid)
+        stt_streamer.finish(request.sid)
         if target_user_id in online_users:
             target_socket_id = online_users[target_user_id].get('socket_id')
+            cancel_tts(target_socket_id)
             emit('call-ended', {}, room=target_socket_id)
 
     @socketio.on('reject-call')
@@ -185,6 +232,20 @@ def register_socket_events():
             target_socket_id = online_users[target_user_id]['socket_id']
             emit('stt-result', {'text': data.get('text')}, room=target_socket_id)
 
+    # Streaming STT: 16-bit mono PCM chunks from the hearing user; partial and
+    # final captions go straight to the peer (stt-partial / stt-result)
+    @socketio.on('stt-audio-chunk')
+    def handle_stt_audio_chunk(data):
+        target_user_id = data.get('to')
+        audio = data.get('audio')
+        if audio and target_user_id in online_users:
+            target_socket_id = online_users[target_user_id]['socket_id']
+            stt_streamer.push(request.sid, target_socket_id, audio, rate=int(data.get('rate', 16000)))
+
+    @socketio.on('stt-stream-end')
+    def handle_stt_stream_end(data=None):
+        stt_streamer.finish(request.sid)
+
 
     # TTS
     @socketio.on('send-text-for-tts')
@@ -197,19 +258,41 @@ def register_socket_events():
             target_socket_id = online_users[target_user_id]['socket_id']
             
             print(f"🔤 Generating TTS for: '{text}' (Target: {target_user_id})")
-            
-           
-            audio_base64 = get_tts_audio(text)
-            
-            if audio_base64:
-                
-                emit('play-audio-message', {
-                    'audio': audio_base64,
-                    'text': text 
-                }, room=target_socket_id)
+
+            # Emit each phrase as soon as it is synthesized; the client queues
+            # them by seq. Failed phrases are still sent (audio None) so the
+            # client never waits on a gap.
+            stream_id = uuid.uuid4().hex
+            try:
+                for seq, phrase, audio, final in stream_tts_audio(text, voice_for(request.sid), owner=request.sid,
+                                                                  group=tts_group(request.sid)):
+                    emit('play-audio-message', {
+                        'audio': audio,
+                        'mime': AUDIO_MIME,
+                        'text': phrase,
+                        'stream_id': stream_id,
+                        'seq': seq,
+                        'final': final,
+                    }, room=target_socket_id)
+                    if audio is None:
+                        print(f"❌ Failed to generate TTS audio for: '{phrase}'")
                 print(f"✅ TTS Audio sent to socket: {target_socket_id}")
-            else:
-                print("❌ Failed to generate TTS audio.")
+            except JobCancelled:
+                print(f"🛑 TTS stream {stream_id} cancelled (call ended)")
+
+    @socketio.on('get-voices')
+    def handle_get_voices():
+        emit('voices', {'voices': list_voices(), 'current': resolve_voice(voice_for(request.sid))}, room=request.sid)
+
+    @socketio.on('set-voice')
+    def handle_set_voice(data):
+        voice = data.get('voice')
+        for user_id, user_data in online_users.items():
+            if user_data['socket_id'] == request.sid:
+                if voice in list_voices():
+                    voice_preferences[user_id] = voice
+                break
+        emit('voices', {'voices': list_voices(), 'current': resolve_voice(voice_for(request.sid))}, room=request.sid)
 
     # sign language deteciton-process frame
     @socketio.on('process-frame')
@@ -219,52 +302,78 @@ def register_socket_events():
         target_user_id = data.get('to')
 
         if image_data:
-            # 2. Run Prediction (AI Model)
-            prediction = detector.predict(image_data)
-            
-            if prediction:
-                print(f"🖐 Sign Detected: {prediction}")
-                
-                # A. Notify the Signer (Deaf User) - Visual Confirmation
-                emit('sign-prediction', {'label': prediction}, room=request.sid)
-
-                cache_key = (request.sid, target_user_id)
-                now = datetime.datetime.utcnow()
-                last_entry = last_sign_spoken.get(cache_key)
-
-                cooldown_expired = False
-                if last_entry:
-                     time_diff = (now - last_entry["time"]).total_seconds()
-                     if time_diff > SIGN_COOLDOWN_SECONDS:
-                         cooldown_expired = True
-
-                should_speak = False
-                if last_entry is None:
-                    should_speak = True
-                elif last_entry["label"] != prediction:
-                    should_speak = True
-                elif cooldown_expired:
-                    should_speak = True
-                
-                # B. Notify the Hearing User - AUDIO (TTS)
-                if should_speak:
-                    if target_user_id in online_users:
-                        target_socket = online_users[target_user_id]['socket_id']
-                        
-                        # Generate Audio for the predicted sign
-                        audio_base64 = get_tts_audio(prediction)
-                        
-                        if audio_base64:
-                            # Send the audio to be played automatically
-                            emit('play-audio-message', {
-                                'audio': audio_base64,
-                                'text': f"(Sign) {prediction}" 
-                            }, room=target_socket)
-
-                        # Update cache only if we spoke
-                        last_sign_spoken[cache_key] = {
-                            "label": prediction,
-                            "time": now
-                        }
-                else:
-                    print(f"Sign detected again: {prediction}")
\ No newline at end of file
+            # 2. Queue for the next batched prediction (AI Model)
+            frame_batcher.submit(request.sid, target_user_id, image_data)
+
+
+def deliver_sign_prediction(sid, target_user_id, prediction):
+    """Route one batched prediction back to the signer and the hearing peer."""
+    if not prediction: return
+
+    print(f"🖐 Sign Detected: {prediction}")
+
+    # A. Notify the Signer (Deaf User) - Visual Confirmation
+    socketio.emit('sign-prediction', {'label': prediction}, room=sid)
+
+    # A batch can finish after its socket disconnected; don't re-create the
+    # per-sid state (cooldowns, TTS group) handle_disconnect already cleared
+    if sid not in connected_sids: return
+
+    cache_key = (sid, target_user_id)
+    now = datetime.datetime.utcnow()
+    last_entry = last_sign_spoken.get(cache_key)
+
+    cooldown_expired = False
+    if last_entry:
+         time_diff = (now - last_entry["time"]).total_seconds()
+         if time_diff > SIGN_COOLDOWN_SECONDS:
+             cooldown_expired = True
+
+    should_speak = False
+    if last_entry is None:
+        should_speak = True
+    elif last_entry["label"] != prediction:
+        should_speak = True
+    elif cooldown_expired:
+        should_speak = True
+
+    # B. Notify the Hearing User - AUDIO (TTS)
+    if should_speak:
+        if target_user_id in online_users:
+            target_socket = online_users[target_user_id]['socket_id']
+
+            # Update cache only if we speak; recorded before synthesis so the
+            # same label from the next batch is not spoken twice meanwhile
+            last_sign_spoken[cache_key] = {
+                "label": prediction,
+                "time": now
+            }
+
+            # Generate Audio for the predicted sign (ahead of any typed text)
+            group = tts_group(sid)
+            try:
+                audio = get_tts_audio(prediction, voice_for(sid), priority=PRIORITY_SIGN,
+                                      owner=sid, group=group)
+            except JobCancelled:
+                return
+
+            if audio:
+                # Send the audio to be played automatically (binary attachment)
+                socketio.emit('play-audio-message', {
+                    'audio': audio,
+                    'mime': AUDIO_MIME,
+                    'text': f"(Sign) {prediction}"
+                }, room=target_socket)
+    else:
+        print(f"Sign detected again: {prediction}")
+
+
+# In-process detector, or a pool of detector processes when SIGN_WORKERS > 0
+if detector is not None:
+    sign_engine = detector
+else:
+    sign_engine = SignWorkerPool()
+    model_manager.register('sign', sign_engine.load)
+motion_gate = MotionGate()
+stt_streamer = SttStreamer()
+frame_batcher = FrameBatcher(sign_engine, deliver_sign_prediction, motion_gate=motion_gate)
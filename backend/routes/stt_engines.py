@@ -0,0 +1,147 @@
+import numpy as np
+import torch
+import whisper
+from config import Config
+from utils.weights import load_whisper_mmap
+
+DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
+
+# Forced English + stable decoding: one greedy pass (temperature 0) over each
+# 30 s window, without timestamps. A window is dropped as silence the way
+# transcribe() does it: likely no speech and low confidence (the low
+# no-speech threshold reduces false "noise" detection).
+LANGUAGE = "en"
+NO_SPEECH_THRESHOLD = 0.1
+LOGPROB_THRESHOLD = -1.0
+
+
+class WhisperEngine:
+    """openai-whisper, fp32 on CPU (fp16 on CUDA), with batched decoding.
+
+    Every engine has the same contract: ``transcribe(audio) -> text`` for a
+    16 kHz float32 clip, and ``transcribe_batch(clips) -> texts``, which the
+    STT batcher calls with the clips pending at once.
+    """
+
+    name = "whisper"
+    # loaded weights survive fork() (serve.py loads them in the master)
+    fork_safe = True
+
+    def __init__(self, model_name=Config.STT_MODEL, device=DEVICE):
+        print(f"--- Whisper ({self.name}, {model_name}) running on {device} ---")
+        # Prefer the memory-mapped export (shared between processes) when present
+        self.model = load_whisper_mmap(model_name, device=device) or whisper.load_model(model_name, device=device)
+        self.options = whisper.DecodingOptions(language=LANGUAGE, task="transcribe", temperature=0.0,
+                                               without_timestamps=True, fp16=device == "cuda")
+
+    def transcribe(self, audio):
+        return self.transcribe_batch([audio])[0]
+
+    def transcribe_batch(self, clips):
+        """One encoder pass over the stacked log-mels, then batched greedy decoding."""
+        windows = [(i, window) for i, clip in enumerate(clips) for window in self._windows(clip)]
+
+        # Log-mel per window (each normalized on its own), padded to 30 s and stacked
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(np.asarray(window, dtype=np.float32))),
+                                        self.model.dims.n_mels)
+            for _, window in windows
+        ]).to(self.model.device)
+
+        texts = [[] for _ in clips]
+        with torch.inference_mode():
+            results = whisper.decode(self.model, mel, self.options)
+        for (i, _), result in zip(windows, results):
+            if result.no_speech_prob > NO_SPEECH_THRESHOLD and result.avg_logprob < LOGPROB_THRESHOLD:
+                continue
+            if result.text.strip():
+                texts[i].append(result.text.strip())
+        return [" ".join(parts) for parts in texts]
+
+    @staticmethod
+    def _windows(audio):
+        # Whisper sees at most 30 s at a time (the VAD keeps clips below that)
+        return [audio[start:start + whisper.audio.N_SAMPLES]
+                for start in range(0, len(audio), whisper.audio.N_SAMPLES)] or [audio]
+
+
+def _plain_linears(module):
+    # whisper.model.Linear only casts its weights to the input dtype;
+    # quantize_dynamic swaps exact nn.Linear modules, so hand it those
+    for name, child in module.named_children():
+        if isinstance(child, torch.nn.Linear) and type(child) is not torch.nn.Linear:
+            linear = torch.nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+            linear.weight = child.weight
+            linear.bias = child.bias
+            setattr(module, name, linear)
+        else:
+            _plain_linears(child)
+    return module
+
+
+class QuantizedWhisperEngine(WhisperEngine):
+    """openai-whisper with dynamic INT8 Linear layers (attention + MLP), CPU only.
+
+    The convolutions, embeddings and the output projection stay fp32. The
+    INT8 weights are private to each process (the mmap export only shares
+    the fp32 checkpoint).
+    """
+
+    name = "whisper-int8"
+
+    def __init__(self, model_name=Config.STT_MODEL):
+        super().__init__(model_name, device="cpu")
+        self.model = torch.ao.quantization.quantize_dynamic(_plain_linears(self.model.eval()),
+                                                            {torch.nn.Linear}, dtype=torch.qint8)
+
+
+class FasterWhisperEngine:
+    """faster-whisper (CTranslate2) with int8 weights; needs ``pip install faster-whisper``.
+
+    The model is converted and downloaded by faster-whisper on first use
+    (or STT_MODEL can point at a converted model folder). CTranslate2 runs
+    its own thread pool, which does not survive fork(), so serve.py loads
+    this engine in each worker instead of the master.
+    """
+
+    name = "faster-whisper"
+    fork_safe = False
+
+    def __init__(self, model_name=Config.STT_MODEL, device=DEVICE, compute_type=Config.STT_COMPUTE_TYPE):
+        try:
+            from faster_whisper import WhisperModel
+        except ImportError as e:
+            raise RuntimeError("STT_ENGINE=faster-whisper needs the faster-whisper package") from e
+
+        print(f"--- Whisper ({self.name}, {model_name}, {compute_type}) running on {device} ---")
+        # Follow torch's thread count (serve.py gives each worker its share of the cores)
+        self.model = WhisperModel(model_name, device=device, compute_type=compute_type,
+                                  cpu_threads=torch.get_num_threads())
+
+    def transcribe(self, audio):
+        segments, _ = self.model.transcribe(
+            np.asarray(audio, dtype=np.float32),
+            language=LANGUAGE,
+            task="transcribe",
+            beam_size=1,
+            temperature=0.0,
+            without_timestamps=True,
+            condition_on_previous_text=False,
+            no_speech_threshold=NO_SPEECH_THRESHOLD,
+            log_prob_threshold=LOGPROB_THRESHOLD,
+        )
+        return " ".join(segment.text.strip() for segment in segments if segment.text.strip())
+
+    def transcribe_batch(self, clips):
+        # CTranslate2 already spreads one clip over the cores
+        return [self.transcribe(clip) for clip in clips]
+
+
+ENGINES = {engine.name: engine for engine in (WhisperEngine, QuantizedWhisperEngine, FasterWhisperEngine)}
+
+
+def load_engine(name=Config.STT_ENGINE, model_name=Config.STT_MODEL):
+    """The STT engine selected by STT_ENGINE ('whisper', 'whisper-int8' or 'faster-whisper')."""
+    if name not in ENGINES:
+        raise ValueError(f"Unknown STT engine {name!r}, expected one of {', '.join(ENGINES)}")
+    return ENGINES[name](model_name)
@@ -1,62 +1,80 @@
 from flask import Blueprint, request, jsonify
-import whisper
-import torch
-import tempfile
-import subprocess
-import os
+import numpy as np
+from config import Config
+from utils.audio import decode_audio, AudioDecodeError
+from utils.vad import VoiceActivityDetector
+from utils.executor import model_executor, ExecutorBusy
+from utils.micro_batcher import MicroBatcher
+from utils.model_manager import model_manager
+from routes.stt_engines import load_engine
 
 stt_bp = Blueprint("stt_bp", __name__)
 
 
 
-# Load Whisper model once
-DEVICE = "cuda" if torch.cuda.is_available() else "cpu"
-print(f"--- Whisper running on {DEVICE} ---")
-whisper_model = whisper.load_model("base", device=DEVICE)
+# Load the STT engine once (through the model manager, not at import time);
+# STT_ENGINE picks openai-whisper, INT8 Whisper or faster-whisper
+def _warmup_stt(engine):
+    # One second of silence exercises the encoder and a decoding step
+    engine.transcribe(np.zeros(16000, dtype=np.float32))
+
+model_manager.register('stt', load_engine, warmup=_warmup_stt)
+
+def _transcribe_batch(clips):
+    return model_manager.get('stt').transcribe_batch(clips)
+
+# Job priorities: finished utterances and uploads before streaming partials
+PRIORITY_FINAL = 0
+PRIORITY_PARTIAL = 1
+
+# Concurrent clips (all calls, uploads and streams) share batched decoding;
+# beyond STT_QUEUE_LIMIT waiting clips submit() raises ExecutorBusy (503 here,
+# skipped partials in the streamer)
+stt_batcher = MicroBatcher('stt', _transcribe_batch,
+                           window_ms=Config.STT_BATCH_WINDOW_MS,
+                           max_batch_size=Config.STT_BATCH_MAX_SIZE,
+                           concurrency=Config.MODEL_CONCURRENCY['stt'],
+                           max_pending=Config.MODEL_QUEUE_LIMIT['stt'])
+
+def transcribe_array(audio, priority=PRIORITY_FINAL, owner=None):
+    """Text of a 16 kHz float32 clip, transcribed off the event loop (batched on the 'stt' lane)."""
+    return stt_batcher.submit(audio, priority=priority, owner=owner)
+
+vad = VoiceActivityDetector()
+
+def transcribe_speech(audio, priority=PRIORITY_FINAL, owner=None):
+    """Text of a clip after VAD: silence is trimmed, long clips are split at
+    pauses, and clips without speech return "" without running Whisper."""
+    texts = [transcribe_array(segment, priority, owner) for segment in vad.split(audio)]
+    return " ".join(text for text in texts if text)
 
 
 # speech to text
 @stt_bp.route('/transcribe', methods=['POST'])
 def transcribe_audio():
     try:
-        file = request.files['file']
+        file = request.files.get('file')
         if not file:
             return jsonify({'error': 'No file provided'}), 400
 
-        with tempfile.NamedTemporaryFile(suffix=".webm", delete=False) as temp_webm:
-            file.save(temp_webm.name)
-            temp_webm_path = temp_webm.name
-
-        temp_wav_path = temp_webm_path.replace(".webm", ".wav")
-
-        cmd = [
-            "ffmpeg", "-y", "-i", temp_webm_path,
-            "-ar", "16000", "-ac", "1",
-            "-loglevel", "error",
-            temp_wav_path
-        ]
-        subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-
-        # result = whisper_model.transcribe(temp_wav_path, fp16=torch.cuda.is_available())
-        # Transcribe with forced English + stable decoding
-        result = whisper_model.transcribe(
-            temp_wav_path,
-            fp16=torch.cuda.is_available(),
-            language="en",
-            task="transcribe",
-            temperature=0.0,            # forces deterministic output
-            no_speech_threshold=0.1,    # reduce false "noise" detection
-            compression_ratio_threshold=2.4,
-        )
-        text = result.get("text", "").strip()
+        # Decode the upload in memory (ffmpeg pipe -> 16 kHz float32), off the event loop
+        audio = model_executor.run('decode', decode_audio, file.read())
 
-        print(f"Whisper transcription: {text}")
+        # Transcribe the speech in it with forced English + stable decoding (off the event loop)
+        text = transcribe_speech(audio)
 
-        os.remove(temp_webm_path)
-        os.remove(temp_wav_path)
+        print(f"Whisper transcription: {text}")
 
         return jsonify({"text": text}), 200
 
+    except AudioDecodeError as e:
+        print(f"Could not decode audio: {e}")
+        return jsonify({'error': 'Could not decode audio'}), 400
+
+    except ExecutorBusy as e:
+        print(f"Transcription rejected: {e}")
+        return jsonify({'error': 'Speech-to-text is busy, try again shortly'}), 503
+
     except Exception as e:
         print(f"Error during transcription: {e}")
         return jsonify({'error': str(e)}), 500
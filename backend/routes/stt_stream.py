@@ -0,0 +1,152 @@
+import threading
+import numpy as np
+from extensions import socketio
+from config import Config
+from utils.audio import SAMPLE_RATE
+from utils.executor import ExecutorBusy
+from routes.stt_routes import transcribe_speech, PRIORITY_PARTIAL
+
+
+class _Stream:
+    def __init__(self):
+        self.target_sid = None
+        self.chunks = []            # float32 audio of the current utterance
+        self.samples = 0
+        self.trailing_silence = 0   # samples of silence at the end of the buffer
+        self.utterance = 0          # bumped whenever the buffer is finalized
+        self.decoded_at = 0         # buffer length at the last partial decode
+        self.decoding = False
+
+
+class SttStreamer:
+    """Streaming captions from PCM chunks sent over the socket.
+
+    Each speaking socket has a rolling buffer holding its current utterance
+    (leading silence is dropped). Every ``interval_ms`` of new audio the
+    whole buffer is re-transcribed and sent to the peer as ``stt-partial``.
+    When the speaker pauses for ``silence_ms`` -- or the buffer reaches
+    ``max_window_s`` -- the utterance is transcribed one last time, sent as
+    ``stt-result`` and the buffer starts over, so the window Whisper sees
+    slides along with the speech and stays bounded.
+
+    Partials are skipped while one is still running for that socket or when
+    the STT batcher's queue is full (ExecutorBusy), and queue behind finals;
+    a final is only dropped when that queue is full.
+    """
+
+    def __init__(self, interval_ms=Config.STT_STREAM_INTERVAL_MS,
+                 max_window_s=Config.STT_STREAM_MAX_WINDOW_S,
+                 silence_ms=Config.STT_STREAM_SILENCE_MS,
+                 energy_threshold=Config.STT_STREAM_ENERGY_THRESHOLD):
+        self.interval = int(interval_ms * SAMPLE_RATE / 1000)
+        self.max_window = int(max_window_s * SAMPLE_RATE)
+        self.silence = int(silence_ms * SAMPLE_RATE / 1000)
+        self.energy_threshold = energy_threshold
+
+        self._streams = {}
+        self._lock = threading.Lock()
+        self._stats = {"chunks": 0, "partials": 0, "partials_skipped": 0, "finals": 0}
+
+    @staticmethod
+    def to_float(pcm, rate=SAMPLE_RATE):
+        """16-bit PCM bytes at ``rate`` -> float32 samples at 16 kHz."""
+        audio = np.frombuffer(pcm, np.int16).astype(np.float32) / 32768.0
+        if rate != SAMPLE_RATE and len(audio):
+            # linear resampling is plenty for speech recognition
+            positions = np.arange(0, len(audio), rate / SAMPLE_RATE)
+            audio = np.interp(positions, np.arange(len(audio)), audio).astype(np.float32)
+        return audio
+
+    def push(self, sid, target_sid, pcm, rate=SAMPLE_RATE):
+        audio = self.to_float(pcm, rate)
+        if not len(audio): return
+
+        silent = float(np.sqrt(np.mean(audio ** 2))) < self.energy_threshold
+        with self._lock:
+            self._stats["chunks"] += 1
+            stream = self._streams.setdefault(sid, _Stream())
+            stream.target_sid = target_sid
+
+            if silent and not stream.samples: return  # no utterance in progress
+            stream.chunks.append(audio)
+            stream.samples += len(audio)
+            stream.trailing_silence = stream.trailing_silence + len(audio) if silent else 0
+
+            if stream.trailing_silence >= self.silence or stream.samples >= self.max_window:
+                final = self._take(stream)
+            else:
+                final = None
+                partial_due = stream.samples - stream.decoded_at >= self.interval
+                if partial_due and not stream.decoding:
+                    stream.decoding = True
+                    stream.decoded_at = stream.samples
+                    socketio.start_background_task(self._partial, stream, stream.utterance,
+                                                   np.concatenate(stream.chunks))
+
+        if final is not None:
+            socketio.start_background_task(self._final, stream.target_sid, final)
+
+    def finish(self, sid):
+        """Flush the socket's current utterance (speaker stopped streaming)."""
+        with self._lock:
+            stream = self._streams.get(sid)
+            final = self._take(stream) if stream and stream.samples else None
+        if final is not None:
+            socketio.start_background_task(self._final, stream.target_sid, final)
+
+    def discard(self, sid):
+        with self._lock:
+            stream = self._streams.pop(sid, None)
+            if stream: stream.utterance += 1  # drop partials still running
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active_streams"] = sum(1 for stream in self._streams.values() if stream.samples)
+        return stats
+
+    def _take(self, stream):
+        # Finalize the utterance (call with the lock held); trailing silence is dropped
+        audio = np.concatenate(stream.chunks)
+        if stream.trailing_silence:
+            audio = audio[:max(0, len(audio) - stream.trailing_silence)]
+        stream.chunks = []
+        stream.samples = 0
+        stream.trailing_silence = 0
+        stream.decoded_at = 0
+        stream.utterance += 1
+        return audio
+
+    def _partial(self, stream, utterance, audio):
+        try:
+            text = transcribe_speech(audio, PRIORITY_PARTIAL, owner=stream.target_sid)
+        except ExecutorBusy:
+            with self._lock:
+                self._stats["partials_skipped"] += 1
+            return
+        except Exception as e:
+            print(f"Error during streaming transcription: {e}")
+            return
+        finally:
+            stream.decoding = False
+
+        # A final for this utterance may already have been sent
+        if text and stream.utterance == utterance:
+            with self._lock:
+                self._stats["partials"] += 1
+            socketio.emit('stt-partial', {'text': text}, room=stream.target_sid)
+
+    def _final(self, target_sid, audio):
+        try:
+            text = transcribe_speech(audio, owner=target_sid)
+        except ExecutorBusy as e:
+            print(f"Streaming transcription rejected: {e}")
+            return
+        except Exception as e:
+            print(f"Error during streaming transcription: {e}")
+            return
+        if text:
+            with self._lock:
+                self._stats["finals"] += 1
+            print(f"Whisper transcription (stream): {text}")
+            socketio.emit('stt-result', {'text': text}, room=target_sid)
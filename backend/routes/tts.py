@@ -1,55 +1,292 @@
 import torch
-import base64
+import copy
 import io
+import os
 import soundfile as sf
 from transformers import SpeechT5Processor, SpeechT5ForTextToSpeech, SpeechT5HifiGan
-from datasets import load_dataset
 import scipy.io.wavfile as wav
 import numpy as np
+import re
+from config import Config
+from utils.audio_cache import AudioCache, normalize_text
+from utils.micro_batcher import MicroBatcher, JobCancelled
+from utils.model_manager import model_manager
+from utils.weights import load_pretrained_mmap
+
+def _bf16_supported():
+    """True when oneDNN has native bfloat16 kernels on this CPU (AVX512-BF16 / AMX)."""
+    check = getattr(torch.ops.mkldnn, '_is_mkldnn_bf16_supported', None)
+    try:
+        return bool(check and torch.backends.mkldnn.is_available() and check())
+    except Exception:
+        return False
+
+# 'fp32', or 'optimized': dynamic INT8 SpeechT5 Linear layers plus a bfloat16
+# vocoder where the CPU supports it (see scripts/check_tts_quality.py)
+TTS_PRECISION = Config.TTS_PRECISION
+VOCODER_BF16 = TTS_PRECISION == 'optimized' and _bf16_supported()
+
+# Part of every cache key: bump when the models or synthesis settings change
+TTS_MODEL_VERSION = "microsoft/speecht5_tts+microsoft/speecht5_hifigan"
+if TTS_PRECISION == 'optimized':
+    TTS_MODEL_VERSION += "+int8" + ("+bf16" if VOCODER_BF16 else "")
+SAMPLE_RATE = 16000
+
+def _audio_format(name):
+    """(container, subtype, mime type) for TTS_AUDIO_FORMAT; 'ogg' needs libsndfile OGG support."""
+    if name == 'ogg':
+        subtypes = sf.available_subtypes('OGG')
+        if 'OPUS' in subtypes: return 'ogg', 'OPUS', 'audio/ogg; codecs=opus'
+        if 'VORBIS' in subtypes: return 'ogg', 'VORBIS', 'audio/ogg; codecs=vorbis'
+        print("⚠️ libsndfile has no OGG encoder, sending 16-bit WAV instead")
+    return 'wav', 'PCM_16', 'audio/wav'
+
+AUDIO_FORMAT, AUDIO_SUBTYPE, AUDIO_MIME = _audio_format(Config.TTS_AUDIO_FORMAT)
+
+tts_cache = AudioCache(Config.TTS_CACHE_MEMORY_MB * 1024 * 1024, Config.TTS_CACHE_DIR, suffix=f'.{AUDIO_FORMAT}',
+                       max_disk_bytes=Config.TTS_CACHE_DISK_MB * 1024 * 1024)
+_persisted_texts = None
+
+def _persist(text):
+    """Whether rendered ``text`` may go to the disk tier: sign labels and
+    TTS_CACHE_DISK_PHRASES only, never users' free typed text."""
+    global _persisted_texts
+    if _persisted_texts is None:
+        from routes.sign_detector import SIGN_CLASSES
+        _persisted_texts = {normalize_text(phrase) for phrase in SIGN_CLASSES + Config.TTS_CACHE_DISK_PHRASES}
+    return text in _persisted_texts
+
+# --- VOICES ---
+# name -> (1, 512) speaker x-vector, from the bundle written by
+# scripts/export_speakers.py (first entry = default voice)
+voices = {}
+_voice_digests = {}
+default_voice = None
+
+def _add_voices(names, xvectors):
+    global default_voice
+    for name, xvector in zip(names, xvectors):
+        xvector = np.ascontiguousarray(xvector, dtype=np.float32)
+        voices[str(name)] = torch.from_numpy(xvector).unsqueeze(0)
+        _voice_digests[str(name)] = xvector.tobytes()
+    if default_voice is None and voices:
+        default_voice = Config.TTS_DEFAULT_VOICE if Config.TTS_DEFAULT_VOICE in voices else next(iter(voices))
+
+def _load_voices():
+    if not os.path.exists(Config.TTS_SPEAKERS_PATH): return
+    with np.load(Config.TTS_SPEAKERS_PATH) as bundle:
+        _add_voices(bundle["names"], bundle["xvectors"])
+    print(f"✅ Loaded {len(voices)} TTS voices (default: {default_voice})")
+
+def _load_default_voice_from_dataset():
+    # Fallback without a bundle: the original voice (row 7306) of the CMU Arctic dataset
+    print(f"⚠️ {Config.TTS_SPEAKERS_PATH} not found, loading the x-vector dataset "
+          "(run scripts.export_speakers to avoid this)")
+    from datasets import load_dataset
+    embeddings_dataset = load_dataset("Matthijs/cmu-arctic-xvectors", split="validation", trust_remote_code=True)
+    _add_voices(["default"], [embeddings_dataset[7306]["xvector"]])
+
+def list_voices():
+    return list(voices)
+
+def resolve_voice(name):
+    return name if name in voices else default_voice
+
+_load_voices()
 
 # --- INITIALIZATION ---
-# Load models once (Global scope) to avoid reloading on every request
-print("⏳ Loading Microsoft SpeechT5 TTS Model...")
-processor = SpeechT5Processor.from_pretrained("microsoft/speecht5_tts")
-model = SpeechT5ForTextToSpeech.from_pretrained("microsoft/speecht5_tts", use_safetensors=True)
-vocoder = SpeechT5HifiGan.from_pretrained("microsoft/speecht5_hifigan")
+# Models are loaded once by the model manager (in the background at startup,
+# or on first use) instead of at import time
+def _load_tts(precision=TTS_PRECISION):
+    print("⏳ Loading Microsoft SpeechT5 TTS Model...")
+    processor = SpeechT5Processor.from_pretrained("microsoft/speecht5_tts")
+    # Prefer the memory-mapped exports (shared between processes) when present
+    model = (load_pretrained_mmap(SpeechT5ForTextToSpeech, "speecht5_tts")
+             or SpeechT5ForTextToSpeech.from_pretrained("microsoft/speecht5_tts", use_safetensors=True))
+    vocoder = (load_pretrained_mmap(SpeechT5HifiGan, "speecht5_hifigan")
+               or SpeechT5HifiGan.from_pretrained("microsoft/speecht5_hifigan"))
+
+    if not voices:
+        _load_default_voice_from_dataset()
+
+    tts = {
+        "processor": processor,
+        "model": model,
+        "vocoder": vocoder,
+    }
+    if precision == 'optimized':
+        tts = optimize_tts(tts, vocoder_bf16=VOCODER_BF16)
+
+    print(f"✅ SpeechT5 Loaded Successfully ({precision})")
+    return tts
+
+class _Bfloat16Vocoder(torch.nn.Module):
+    """HiFi-GAN computed in bfloat16, taking and returning float32 tensors."""
+
+    def __init__(self, vocoder):
+        super().__init__()
+        self.vocoder = vocoder.to(torch.bfloat16)
 
-# Load a default speaker voice (xvector) from CMU Arctic dataset
-embeddings_dataset = load_dataset("Matthijs/cmu-arctic-xvectors", split="validation", trust_remote_code=True)
-speaker_embeddings = torch.tensor(embeddings_dataset[7306]["xvector"]).unsqueeze(0)
+    def forward(self, spectrogram):
+        return self.vocoder(spectrogram.to(torch.bfloat16)).float()
 
-print("✅ SpeechT5 Loaded Successfully")
+def optimize_tts(tts, vocoder_bf16=False):
+    """Copy of a loaded TTS bundle with INT8 SpeechT5 Linear layers (and a bf16 vocoder).
 
-def get_tts_audio(text):
+    The fp32 modules are left untouched, so the harness can compare both.
+    """
+    model = torch.ao.quantization.quantize_dynamic(tts["model"], {torch.nn.Linear}, dtype=torch.qint8)
+    vocoder = _Bfloat16Vocoder(copy.deepcopy(tts["vocoder"])) if vocoder_bf16 else tts["vocoder"]
+    return dict(tts, model=model.eval(), vocoder=vocoder.eval())
+
+def _generate_batch(tts, texts, voice_names):
+    """Synthesize several texts in one padded pass; returns one waveform per text."""
+    # 1. Prepare inputs (padded to the longest text), one speaker x-vector per row
+    inputs = tts["processor"](text=texts, padding=True, return_tensors="pt")
+    speakers = torch.cat([voices[name] for name in voice_names])
+
+    # 2. Generate audio (tensor form): each sequence stops at its own stop
+    # token, then HiFi-GAN runs once over the padded spectrogram batch
+    with torch.inference_mode():
+        speech, lengths = tts["model"].generate_speech(
+            inputs["input_ids"], speakers, attention_mask=inputs["attention_mask"],
+            vocoder=tts["vocoder"], return_output_lengths=True)
+    if speech.dim() == 1:
+        speech = speech.unsqueeze(0)
+    return [speech[i, :int(lengths[i])] for i in range(len(texts))]
+
+def _cache_key(text, voice):
+    digest = _voice_digests.get(voice)
+    if digest is None: return None
+    return AudioCache.key(text, digest, TTS_MODEL_VERSION, AUDIO_MIME)
+
+def _encode(speech):
+    # Create a virtual file in memory (RAM), not on disk, and write the audio
+    # data to it (SpeechT5 uses 16000Hz sample rate)
+    byte_io = io.BytesIO()
+    samples = speech.numpy()
+    if AUDIO_FORMAT == 'ogg':
+        sf.write(byte_io, samples, SAMPLE_RATE, format='OGG', subtype=AUDIO_SUBTYPE)
+    else:
+        # 16-bit PCM: half the size of the float32 output, no audible difference
+        wav.write(byte_io, SAMPLE_RATE, (np.clip(samples, -1.0, 1.0) * 32767).astype(np.int16))
+    return byte_io.getvalue()
+
+def _render_batch(requests, tts=None):
+    """Encoded audio for each (normalized text, voice); one batched synthesis, results cached.
+
+    The warm-up passes the bundle it is warming: ``model_manager.get`` only
+    returns once the warm-up has finished. Voices are resolved only here,
+    after loading, which may have added the fallback default voice.
+    """
+    tts = tts or model_manager.get('tts')
+    if default_voice is None:
+        raise RuntimeError("No TTS voice is loaded")
+    requests = [(text, resolve_voice(voice)) for text, voice in requests]
+    unique = list(dict.fromkeys(requests))
+    speech = _generate_batch(tts, [text for text, _ in unique], [voice for _, voice in unique])
+    rendered = {}
+    for (text, voice), waveform in zip(unique, speech):
+        rendered[text, voice] = _encode(waveform)
+        tts_cache.put(_cache_key(text, voice), rendered[text, voice], persist=_persist(text))
+    return [rendered[request] for request in requests]
+
+def _warmup_tts(tts):
+    _generate_batch(tts, ["Hello"], [default_voice])
+
+    # Pre-render the sign vocabulary (default voice) so sign-triggered speech is
+    # a cache lookup (only the first start after a model/voice change synthesizes)
+    from routes.sign_detector import SIGN_CLASSES
+    labels = [(normalize_text(label), default_voice) for label in SIGN_CLASSES]
+    missing = [label for label in labels if tts_cache.get(_cache_key(*label)) is None]
+    size = max(1, Config.TTS_BATCH_MAX_SIZE)
+    for i in range(0, len(missing), size):
+        _render_batch(missing[i:i + size], tts)
+
+model_manager.register('tts', _load_tts, warmup=_warmup_tts)
+
+# Job priorities: short sign labels are spoken before typed free text
+PRIORITY_SIGN = 0
+PRIORITY_TEXT = 1
+
+# Concurrent requests (all calls, streamed phrases) share batched synthesis;
+# pending jobs are scheduled by priority, then round-robin per owner (user)
+tts_batcher = MicroBatcher('tts', _render_batch,
+                           window_ms=Config.TTS_BATCH_WINDOW_MS,
+                           max_batch_size=Config.TTS_BATCH_MAX_SIZE,
+                           concurrency=Config.MODEL_CONCURRENCY['tts'])
+
+_SENTENCE_END = re.compile(r'(?<=[.!?;:])\s+')
+_CLAUSE_END = re.compile(r'(?<=,)\s+')
+
+def _pack(pieces, max_chars):
+    """Greedily join ``pieces`` with spaces into chunks of at most ``max_chars``."""
+    chunks, current = [], ""
+    for piece in pieces:
+        if current and len(current) + 1 + len(piece) > max_chars:
+            chunks.append(current)
+            current = piece
+        else:
+            current = f"{current} {piece}" if current else piece
+    if current:
+        chunks.append(current)
+    return chunks
+
+def split_phrases(text, max_chars=Config.TTS_CHUNK_MAX_CHARS):
+    """Split text into sentences, and over-long sentences into clauses/word runs.
+
+    Each phrase is synthesized separately when streaming, so the first one
+    determines time-to-first-audio.
+    """
+    phrases = []
+    for sentence in _SENTENCE_END.split(normalize_text(text)):
+        if len(sentence) <= max_chars:
+            phrases.append(sentence)
+            continue
+        for clause in _pack(_CLAUSE_END.split(sentence), max_chars):
+            phrases.extend(_pack(clause.split(), max_chars) if len(clause) > max_chars else [clause])
+    return [phrase for phrase in phrases if phrase]
+
+def get_tts_audio(text, voice=None, priority=PRIORITY_TEXT, owner=None, group=None):
+    """Encoded audio bytes (AUDIO_MIME) for ``text`` in ``voice``, or None on failure.
+
+    Sent as a binary Socket.IO attachment, so no base64 on either end.
+    Raises JobCancelled once ``group`` (the requesting socket's call) has
+    been cancelled with ``tts_batcher.cancel``.
+    """
+    if group is not None and group.cancelled:
+        raise JobCancelled(f"TTS for {group.name} was cancelled")
+    text = normalize_text(text)
+    if not text: return None
+    # Until the model has loaded there may be no voices yet (the fallback
+    # default voice is added by _load_tts); _render_batch resolves it again
+    voice = resolve_voice(voice) or voice or Config.TTS_DEFAULT_VOICE
     try:
-        # 1. Prepare inputs
-        inputs = processor(text=text, return_tensors="pt")
-        
-        # 2. Generate audio (tensor form)
-        # Note: Ensure 'speaker_embeddings' and 'vocoder' are accessible here
-        speech = model.generate_speech(inputs["input_ids"], speaker_embeddings, vocoder=vocoder)
-        
-        # 3. Create a virtual file in memory (RAM), not on disk
-        byte_io = io.BytesIO()
-        
-        # 4. Write the audio data to this virtual file as a WAV
-        # SpeechT5 uses 16000Hz sample rate
-        wav.write(byte_io, 16000, speech.numpy())
-        
-        # 5. Rewind the virtual file to the beginning so we can read it
-        byte_io.seek(0)
-        
-        # 6. Convert the file data to Base64 (The format React needs)
-        audio_base64 = base64.b64encode(byte_io.read()).decode('utf-8')
-        
-        return audio_base64
+        # 1. Cached audio (sign labels, repeated phrases) skips the model entirely
+        key = _cache_key(text, voice)
+        audio = tts_cache.get(key) if key else None
 
+        # 2. Otherwise synthesize off the event loop, batched with other
+        # pending requests (bounded by the 'tts' executor lane)
+        if audio is None:
+            audio = tts_batcher.submit((text, voice), priority=priority, owner=owner, group=group)
+        return audio
+
+    except JobCancelled:
+        raise
     except Exception as e:
         print(f"❌ Error inside get_tts_audio: {e}")
         return None
+def stream_tts_audio(text, voice=None, owner=None, group=None):
+    """Yield ``(seq, phrase, audio, final)`` per phrase, in order, as each is ready."""
+    phrases = split_phrases(text) if Config.TTS_STREAMING else [normalize_text(text)]
+    for seq, phrase in enumerate(phrases):
+        audio = get_tts_audio(phrase, voice, priority=PRIORITY_TEXT, owner=owner, group=group)
+        yield seq, phrase, audio, seq == len(phrases) - 1
+
 # Test Block
 if __name__ == "__main__":
     print("Testing TTS...")
     result = get_tts_audio("Hello, this is Microsoft Speech T5 speaking.")
     if result:
-        print(f"✅ Generated Audio (Length: {len(result)})")
\ No newline at end of file
+        print(f"✅ Generated Audio ({AUDIO_MIME}, {len(result)} bytes)")
\ No newline at end of file
@@ -0,0 +1,77 @@
+"""Micro-benchmark for the sign frame preprocessing.
+
+Times the original albumentations pipeline used by SignDetector against the
+fused FramePreprocessor on synthetic JPEG frames (tests/test_preprocess.py
+checks that their outputs match).
+
+Run from the backend folder:
+    python -m scripts.bench_preprocess --iterations 500
+"""
+import argparse
+import sys
+import time
+
+import albumentations as A
+import cv2
+import numpy as np
+from albumentations.pytorch import ToTensorV2
+
+from ai.preprocess import FramePreprocessor, IMAGENET_MEAN, IMAGENET_STD
+
+
+def albumentations_preprocess(transform, image_bytes):
+    """The pre-FramePreprocessor path: imdecode -> cvtColor -> Compose -> unsqueeze."""
+    frame = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    frame_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    return transform(image=frame_rgb)['image'].unsqueeze(0)
+
+
+def make_jpeg(width, height, seed=0):
+    """Smooth synthetic frame so the JPEG looks like camera footage, not noise."""
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, size=(height // 16 + 1, width // 16 + 1, 3), dtype=np.uint8)
+    frame = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 50])
+    assert ok
+    return encoded.tobytes()
+
+
+def time_per_frame(fn, iterations):
+    fn()  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=300)
+    args = parser.parse_args()
+
+    transform = A.Compose([
+        A.Resize(224, 224),
+        A.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+        ToTensorV2()
+    ])
+    fused = FramePreprocessor(size=224, max_batch_size=1, reduced_decode=False)
+    fused_reduced = FramePreprocessor(size=224, max_batch_size=1, reduced_decode=True)
+
+    def run_fused(preprocessor, image_bytes):
+        batch, _ = preprocessor([preprocessor.decode(image_bytes)])
+        return batch
+
+    print(f"{'frame':>10} | {'albumentations':>14} | {'fused':>8} | {'fused+reduced':>13}")
+    for width, height in ((320, 240), (640, 480), (1280, 720)):
+        image_bytes = make_jpeg(width, height)
+
+        t_ref = time_per_frame(lambda: albumentations_preprocess(transform, image_bytes), args.iterations)
+        t_fused = time_per_frame(lambda: run_fused(fused, image_bytes), args.iterations)
+        t_reduced = time_per_frame(lambda: run_fused(fused_reduced, image_bytes), args.iterations)
+
+        print(f"{width}x{height:<6} | {t_ref:>11.3f} ms | {t_fused:>5.3f} ms | {t_reduced:>10.3f} ms")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
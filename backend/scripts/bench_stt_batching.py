@@ -0,0 +1,119 @@
+"""Compare STT throughput with and without cross-request batching.
+
+For each concurrency level N, N synthetic clips are transcribed
+  - one at a time with openai-whisper's transcribe (the unbatched path), and
+  - by N threads submitting at once through the MicroBatcher, which
+    stacks their log-mels into one encoder pass and decodes them greedily
+    as a batch.
+The clips are voiced, syllable-modulated harmonic signals of varying pitch
+and length, so no dataset or download is needed; --tts synthesizes real
+phrases with the SpeechT5 model instead (more realistic decode lengths).
+The VAD is bypassed, so every clip reaches Whisper.
+
+Run from the backend folder:
+    python -m scripts.bench_stt_batching --levels 1 4 8 16
+"""
+import argparse
+import sys
+import threading
+import time
+
+import numpy as np
+import torch
+
+from routes.stt_engines import WhisperEngine
+from utils.audio import SAMPLE_RATE
+from utils.micro_batcher import MicroBatcher
+
+PHRASES = [
+    "Hello, how are you today?",
+    "Thank you for calling.",
+    "Could you please repeat that?",
+    "I will be there in ten minutes.",
+    "Good morning, nice to meet you.",
+    "The meeting has been moved to Friday.",
+    "Please speak a little slower.",
+    "Let me check and get back to you.",
+]
+
+
+def synthetic_clip(seed, seconds):
+    """Speech-like audio: a harmonic tone with gliding pitch, gated into syllables."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * rng.uniform(0.5, 2) * t))
+    phase = 2 * np.pi * np.cumsum(pitch) / SAMPLE_RATE
+    voice = sum(np.sin(k * phase) / k for k in range(1, 8))
+    syllables = np.clip(np.sin(2 * np.pi * rng.uniform(3, 5) * t), 0, None) ** 0.5
+    audio = 0.2 * voice * syllables + 0.005 * rng.standard_normal(len(t))
+    return audio.astype(np.float32)
+
+
+def tts_clips(count):
+    from routes import tts
+    bundle = tts._load_tts()
+    speech = tts._generate_batch(bundle, [PHRASES[i % len(PHRASES)] for i in range(count)],
+                                 [tts.default_voice] * count)
+    return [waveform.float().numpy() for waveform in speech]
+
+
+def run_sequential(engine, clips):
+    options = dict(language="en", task="transcribe", temperature=0.0, fp16=engine.options.fp16)
+    start = time.perf_counter()
+    for clip in clips:
+        engine.model.transcribe(clip, **options)
+    return time.perf_counter() - start
+
+
+def run_batched(engine, clips, window_ms):
+    batcher = MicroBatcher('stt', engine.transcribe_batch,
+                           window_ms=window_ms, max_batch_size=len(clips), max_pending=len(clips))
+    results = [None] * len(clips)
+
+    def request(i):
+        results[i] = batcher.submit(clips[i])
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(len(clips))]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, batcher.stats()["avg_batch_size"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--window-ms', type=int, default=20)
+    parser.add_argument('--tts', action='store_true', help='synthesize the clips with SpeechT5')
+    parser.add_argument('--threads', type=int, default=0, help='torch threads (0 = default)')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    count = max(args.levels)
+    if args.tts:
+        print("⏳ Synthesizing clips with SpeechT5...")
+        clips = tts_clips(count)
+    else:
+        clips = [synthetic_clip(i, 2.0 + (i % 4)) for i in range(count)]
+
+    print("⏳ Loading Whisper...")
+    engine = WhisperEngine()
+    engine.transcribe(clips[0])  # warm-up
+
+    print(f"{'N':>3} {'sequential':>12} {'batched':>12} {'speedup':>8} {'batch':>6} {'clips/s':>14} {'audio s/s':>14}")
+    for n in args.levels:
+        subset = clips[:n]
+        audio_seconds = sum(len(clip) for clip in subset) / SAMPLE_RATE
+        seq_time = run_sequential(engine, subset)
+        bat_time, avg_batch = run_batched(engine, subset, args.window_ms)
+        print(f"{n:>3} {seq_time:>11.2f}s {bat_time:>11.2f}s {seq_time / bat_time:>7.2f}x {avg_batch:>6.1f} "
+              f"{n / seq_time:>6.2f} → {n / bat_time:<5.2f} {audio_seconds / seq_time:>6.2f} → {audio_seconds / bat_time:<5.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Compare STT engines on a local fixture set: real-time factor and word error rate.
+
+The fixture folder holds audio clips with a transcript next to each one
+(hello.wav + hello.txt; any format ffmpeg decodes works). Every engine
+transcribes every clip one at a time through the same ``transcribe(audio)``
+call the server uses, and the script reports per engine:
+  - RTF (transcription time / audio duration, lower is faster) and the
+    speedup over the first engine listed,
+  - WER against the transcripts, after Whisper's English text normalizer
+    (case, punctuation, spelled-out numbers, ...).
+The VAD is not applied, so the engines see identical audio.
+
+Run from the backend folder:
+    python -m scripts.bench_stt_engines --fixtures path/to/clips --engines whisper whisper-int8 faster-whisper
+"""
+import argparse
+import os
+import sys
+import time
+
+import torch
+from whisper.normalizers import EnglishTextNormalizer
+
+from routes.stt_engines import ENGINES, load_engine
+from utils.audio import SAMPLE_RATE, decode_audio
+
+AUDIO_EXTENSIONS = ('.wav', '.flac', '.mp3', '.ogg', '.webm', '.m4a')
+
+
+def load_fixtures(folder):
+    fixtures = []
+    for name in sorted(os.listdir(folder)):
+        stem, extension = os.path.splitext(name)
+        transcript = os.path.join(folder, stem + '.txt')
+        if extension.lower() not in AUDIO_EXTENSIONS or not os.path.exists(transcript): continue
+        with open(os.path.join(folder, name), 'rb') as f:
+            audio = decode_audio(f.read())
+        with open(transcript, encoding='utf-8') as f:
+            fixtures.append((stem, audio, f.read().strip()))
+    return fixtures
+
+
+def word_errors(reference, hypothesis):
+    """Word-level edit distance (substitutions + deletions + insertions)."""
+    previous = list(range(len(hypothesis) + 1))
+    for i, ref_word in enumerate(reference, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hypothesis, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word)))
+        previous = current
+    return previous[-1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--fixtures', required=True, help='folder of audio clips with .txt transcripts')
+    parser.add_argument('--engines', nargs='+', default=list(ENGINES), choices=list(ENGINES))
+    parser.add_argument('--model', default='base', help='Whisper model size (or converted model folder)')
+    parser.add_argument('--max-wer', type=float, default=None, help='fail when an engine exceeds this WER (0-1)')
+    parser.add_argument('--verbose', action='store_true', help='print every transcription')
+    parser.add_argument('--threads', type=int, default=0, help='torch threads (0 = default)')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    fixtures = load_fixtures(args.fixtures)
+    if not fixtures:
+        print(f"❌ No clips with transcripts in {args.fixtures}")
+        return 1
+    audio_seconds = sum(len(audio) for _, audio, _ in fixtures) / SAMPLE_RATE
+    print(f"{len(fixtures)} clips, {audio_seconds:.1f} s of audio")
+
+    normalize = EnglishTextNormalizer()
+    results = {}
+    for name in args.engines:
+        print(f"⏳ Loading {name}...")
+        try:
+            engine = load_engine(name, args.model)
+        except Exception as e:
+            print(f"⚠️ {name} skipped: {e}")
+            continue
+        engine.transcribe(fixtures[0][1])  # warm-up
+
+        elapsed, errors, words = 0.0, 0, 0
+        for stem, audio, transcript in fixtures:
+            start = time.perf_counter()
+            text = engine.transcribe(audio)
+            elapsed += time.perf_counter() - start
+
+            reference, hypothesis = normalize(transcript).split(), normalize(text).split()
+            errors += word_errors(reference, hypothesis)
+            words += len(reference)
+            if args.verbose:
+                print(f"  {stem}: {text}")
+        results[name] = (elapsed / audio_seconds, errors / max(1, words))
+
+    if not results:
+        return 1
+    baseline_rtf = next(iter(results.values()))[0]
+    print(f"\n{'engine':<16} {'RTF':>7} {'speedup':>8} {'WER':>7}")
+    for name, (rtf, wer) in results.items():
+        print(f"{name:<16} {rtf:>7.3f} {baseline_rtf / rtf:>7.2f}x {wer:>6.1%}")
+
+    failed = [name for name, (_, wer) in results.items() if args.max_wer is not None and wer > args.max_wer]
+    if failed:
+        print(f"❌ WER above {args.max_wer:.1%}: {', '.join(failed)}")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
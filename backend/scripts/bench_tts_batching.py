@@ -0,0 +1,96 @@
+"""Compare TTS throughput with and without cross-request batching.
+
+For each concurrency level N, N distinct phrases are synthesized
+  - one request at a time (the unbatched path), and
+  - by N threads submitting at once through the MicroBatcher, which
+    gathers them into padded SpeechT5 + HiFi-GAN batches.
+The audio cache is not used, so every request is a real synthesis.
+
+Run from the backend folder:
+    python -m scripts.bench_tts_batching --levels 1 4 8 16
+"""
+import argparse
+import sys
+import threading
+import time
+
+import torch
+
+from routes import tts
+from utils.micro_batcher import MicroBatcher
+
+PHRASES = [
+    "Hello, how are you today?",
+    "Thank you for calling.",
+    "Could you please repeat that?",
+    "I will be there in ten minutes.",
+    "Good morning, nice to meet you.",
+    "The meeting has been moved to Friday.",
+    "Please speak a little slower.",
+    "I did not understand the last part.",
+    "Let me check and get back to you.",
+    "That sounds like a great idea.",
+    "Can you hear me clearly now?",
+    "I am sorry, that was my mistake.",
+    "See you tomorrow afternoon.",
+    "Where should we meet?",
+    "My train is running late.",
+    "Congratulations on the new job!",
+]
+
+
+def run_sequential(bundle, texts):
+    audio_seconds = 0.0
+    start = time.perf_counter()
+    for text in texts:
+        speech = tts._generate_batch(bundle, [text], [tts.default_voice])[0]
+        audio_seconds += speech.shape[-1] / tts.SAMPLE_RATE
+    return time.perf_counter() - start, audio_seconds
+
+
+def run_batched(bundle, texts, window_ms):
+    batcher = MicroBatcher('tts', lambda batch: tts._generate_batch(bundle, batch, [tts.default_voice] * len(batch)),
+                           window_ms=window_ms, max_batch_size=len(texts), max_pending=len(texts))
+    results = [None] * len(texts)
+
+    def request(i):
+        results[i] = batcher.submit(texts[i])
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(len(texts))]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    audio_seconds = sum(speech.shape[-1] for speech in results) / tts.SAMPLE_RATE
+    return elapsed, audio_seconds, batcher.stats()["avg_batch_size"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--levels', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--window-ms', type=int, default=30)
+    parser.add_argument('--threads', type=int, default=0, help='torch threads (0 = default)')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("⏳ Loading SpeechT5...")
+    bundle = tts._load_tts()
+    tts._generate_batch(bundle, ["Hello"], [tts.default_voice])  # warm-up
+
+    print(f"{'N':>3} {'sequential':>12} {'batched':>12} {'speedup':>8} {'batch':>6} {'req/s':>14} {'audio s/s':>14}")
+    for n in args.levels:
+        texts = [PHRASES[i % len(PHRASES)] for i in range(n)]
+        seq_time, seq_audio = run_sequential(bundle, texts)
+        bat_time, bat_audio, avg_batch = run_batched(bundle, texts, args.window_ms)
+        print(f"{n:>3} {seq_time:>11.2f}s {bat_time:>11.2f}s {seq_time / bat_time:>7.2f}x {avg_batch:>6.1f} "
+              f"{n / seq_time:>6.2f} → {n / bat_time:<5.2f} {seq_audio / seq_time:>6.2f} → {bat_audio / bat_time:<5.2f}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,74 @@
+"""Check that the eager, TorchScript and ONNX Runtime sign backends agree, and time them.
+
+Run from the backend folder after scripts.export_sign_model:
+    python -m scripts.check_sign_backends --frames samples/frames
+Without --frames random inputs are used.
+"""
+import argparse
+import os
+import sys
+import time
+
+import torch
+
+from ai.model import DETR
+from ai.backends import EagerBackend, TorchScriptBackend, OnnxRuntimeBackend
+from scripts.frames import list_frames, load_tensors
+
+
+def time_per_batch(backend, batch, iterations):
+    backend(batch)  # warm-up
+    start = time.perf_counter()
+    for _ in range(iterations):
+        backend(batch)
+    return (time.perf_counter() - start) / iterations * 1000.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.path.join('ai', '29_model.pt'))
+    parser.add_argument('--torchscript', default=os.path.join('ai', '29_model.ts'))
+    parser.add_argument('--onnx', default=os.path.join('ai', '29_model.onnx'))
+    parser.add_argument('--frames', help='folder of sample frames (jpg/png)')
+    parser.add_argument('--num-classes', type=int, default=11)
+    parser.add_argument('--iterations', type=int, default=20)
+    parser.add_argument('--atol', type=float, default=1e-3)
+    args = parser.parse_args()
+
+    model = DETR(num_classes=args.num_classes, pretrained_backbone=False)
+    model.load_state_dict(torch.load(args.checkpoint, map_location='cpu'))
+    model.enable_inference_mode()
+
+    backends = [EagerBackend(model)]
+    if os.path.exists(args.torchscript):
+        backends.append(TorchScriptBackend(args.torchscript))
+    if os.path.exists(args.onnx):
+        backends.append(OnnxRuntimeBackend(args.onnx))
+    if len(backends) == 1:
+        print("❌ No exported models found, run scripts.export_sign_model first")
+        return 1
+
+    if args.frames:
+        inputs = torch.stack(load_tensors(list_frames(args.frames, limit=8)))
+    else:
+        inputs = torch.randn(8, 3, 224, 224)
+
+    ok = True
+    for batch_size in (1, inputs.shape[0]):
+        batch = inputs[:batch_size]
+        reference = backends[0](batch)
+        for backend in backends:
+            logits = backend(batch)
+            diff = (logits - reference).abs().max().item()
+            same_top1 = bool((logits.argmax(-1) == reference.argmax(-1)).all())
+            passed = diff <= args.atol and same_top1
+            ok = ok and passed
+            latency = time_per_batch(backend, batch, args.iterations)
+            print(f"{'✅' if passed else '❌'} {backend.name:<12} batch={batch_size:<2} "
+                  f"max |diff| {diff:.2e}  {latency:8.2f} ms/batch")
+
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
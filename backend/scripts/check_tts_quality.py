@@ -0,0 +1,108 @@
+"""Compare the optimized TTS mode against fp32: real-time factor and spectral distance.
+
+Synthesizes a fixed phrase set with the fp32 SpeechT5 + HiFi-GAN and with
+the optimized variant (dynamic INT8 Linear layers, bf16 vocoder when the
+CPU supports it) and reports, per phrase and overall:
+  - RTF (synthesis time / audio duration, lower is faster) for both,
+  - log-spectral distance (LSD, dB) between the two waveforms,
+  - duration ratio (the decoder may stop a few frames earlier/later).
+SpeechT5 keeps prenet dropout active at inference, so both variants are
+run with the same seed per phrase; --reference adds a second fp32 run with
+another seed as the natural run-to-run LSD floor.
+
+Run from the backend folder:
+    python -m scripts.check_tts_quality --max-lsd 3.0
+"""
+import argparse
+import sys
+import time
+
+import torch
+
+from routes import tts
+
+PHRASES = [
+    "Hello, how are you today?",
+    "Thank you for calling.",
+    "Could you please repeat that?",
+    "The meeting has been moved to Friday afternoon.",
+    "I did not understand the last part, please speak a little slower.",
+    "Congratulations on the new job!",
+    "break", "book", "good morning", "please", "quiet",
+]
+
+
+def synthesize(bundle, text, seed):
+    torch.manual_seed(seed)
+    start = time.perf_counter()
+    speech = tts._generate_batch(bundle, [text], [tts.default_voice])[0]
+    return speech.float(), time.perf_counter() - start
+
+
+def log_spectral_distance(a, b, n_fft=512, hop=128):
+    """Mean over frames of the RMS difference of the dB magnitude spectra."""
+    length = min(a.shape[-1], b.shape[-1])
+    window = torch.hann_window(n_fft)
+    spectra = [torch.stft(x[:length], n_fft, hop, window=window, return_complex=True).abs()
+               for x in (a, b)]
+    db_a, db_b = (20 * torch.log10(spectrum + 1e-5) for spectrum in spectra)
+    return ((db_a - db_b) ** 2).mean(dim=0).sqrt().mean().item()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--max-lsd', type=float, default=None, help='fail when the mean LSD exceeds this (dB)')
+    parser.add_argument('--bf16', choices=('auto', 'on', 'off'), default='auto', help='bfloat16 vocoder')
+    parser.add_argument('--reference', action='store_true', help='also measure fp32 vs fp32 with another seed')
+    parser.add_argument('--threads', type=int, default=0, help='torch threads (0 = default)')
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    print("⏳ Loading SpeechT5 (fp32)...")
+    fp32 = tts._load_tts('fp32')
+    bf16 = tts._bf16_supported() if args.bf16 == 'auto' else args.bf16 == 'on'
+    optimized = tts.optimize_tts(fp32, vocoder_bf16=bf16)
+    print(f"Optimized variant: INT8 Linear layers, vocoder in {'bf16' if bf16 else 'fp32'}")
+
+    for bundle in (fp32, optimized):
+        synthesize(bundle, "Hello", 0)  # warm-up
+
+    totals = {"fp32_time": 0.0, "opt_time": 0.0, "fp32_audio": 0.0, "opt_audio": 0.0}
+    distances, floors = [], []
+    print(f"{'phrase':<40} {'RTF fp32':>9} {'RTF opt':>8} {'LSD dB':>7} {'dur':>6}" + (f" {'floor':>6}" if args.reference else ""))
+    for i, text in enumerate(PHRASES):
+        reference, fp32_time = synthesize(fp32, text, i)
+        candidate, opt_time = synthesize(optimized, text, i)
+        fp32_audio = reference.shape[-1] / tts.SAMPLE_RATE
+        opt_audio = candidate.shape[-1] / tts.SAMPLE_RATE
+
+        totals["fp32_time"] += fp32_time
+        totals["opt_time"] += opt_time
+        totals["fp32_audio"] += fp32_audio
+        totals["opt_audio"] += opt_audio
+        distances.append(log_spectral_distance(reference, candidate))
+
+        line = (f"{text[:40]:<40} {fp32_time / fp32_audio:>9.3f} {opt_time / opt_audio:>8.3f} "
+                f"{distances[-1]:>7.2f} {opt_audio / fp32_audio:>6.2f}")
+        if args.reference:
+            other, _ = synthesize(fp32, text, i + 1000)
+            floors.append(log_spectral_distance(reference, other))
+            line += f" {floors[-1]:>6.2f}"
+        print(line)
+
+    mean_lsd = sum(distances) / len(distances)
+    fp32_rtf = totals["fp32_time"] / totals["fp32_audio"]
+    opt_rtf = totals["opt_time"] / totals["opt_audio"]
+    print(f"\nRTF fp32 {fp32_rtf:.3f}  optimized {opt_rtf:.3f}  ({fp32_rtf / opt_rtf:.2f}x faster)")
+    print(f"Mean LSD {mean_lsd:.2f} dB" + (f"  (fp32 run-to-run floor {sum(floors) / len(floors):.2f} dB)" if floors else ""))
+
+    if args.max_lsd is not None and mean_lsd > args.max_lsd:
+        print(f"❌ Mean LSD above {args.max_lsd} dB")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""Export the TTS/STT weights as mmap-able checkpoints for MODEL_WEIGHTS_DIR.
+
+Writes <out>/speecht5_tts.pt, <out>/speecht5_hifigan.pt (each with its config
+folder) and <out>/whisper_base.pt. The sign model checkpoint (ai/29_model.pt)
+is already a zip-format state dict and is mapped in place.
+
+Run from the backend folder:
+    python -m scripts.export_mmap_weights --out weights
+then serve with MODEL_WEIGHTS_DIR=weights.
+"""
+import argparse
+import os
+import sys
+
+import torch
+import whisper
+from transformers import SpeechT5ForTextToSpeech, SpeechT5HifiGan
+
+
+def export_pretrained(model, out_dir, name):
+    model.config.save_pretrained(os.path.join(out_dir, name))
+    path = os.path.join(out_dir, f"{name}.pt")
+    # Plain fp32 state dict in torch's zip format, which torch.load can mmap
+    torch.save({k: v.contiguous() for k, v in model.state_dict().items()}, path)
+    print(f"✅ {name} -> {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', default='weights')
+    parser.add_argument('--whisper-model', default='base')
+    args = parser.parse_args()
+
+    os.makedirs(args.out, exist_ok=True)
+
+    export_pretrained(SpeechT5ForTextToSpeech.from_pretrained("microsoft/speecht5_tts", use_safetensors=True),
+                      args.out, "speecht5_tts")
+    export_pretrained(SpeechT5HifiGan.from_pretrained("microsoft/speecht5_hifigan"),
+                      args.out, "speecht5_hifigan")
+
+    # Whisper ships fp16 weights; store the fp32 copy the CPU path actually runs
+    whisper_model = whisper.load_model(args.whisper_model, device='cpu')
+    path = os.path.join(args.out, f"whisper_{args.whisper_model}.pt")
+    torch.save({
+        'dims': vars(whisper_model.dims),
+        'model_state_dict': {k: v.contiguous() for k, v in whisper_model.state_dict().items()},
+    }, path)
+    print(f"✅ whisper_{args.whisper_model} -> {path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
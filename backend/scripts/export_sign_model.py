@@ -0,0 +1,43 @@
+"""Export the sign language DETR checkpoint for the TorchScript / ONNX Runtime backends.
+
+Run from the backend folder:
+    python -m scripts.export_sign_model --format all
+then serve it with SIGN_BACKEND=torchscript or SIGN_BACKEND=onnx.
+"""
+import argparse
+import os
+import sys
+
+import torch
+
+from ai.model import DETR
+from ai.backends import export_torchscript, export_onnx
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.path.join('ai', '29_model.pt'))
+    parser.add_argument('--format', choices=('torchscript', 'onnx', 'all'), default='all')
+    parser.add_argument('--torchscript-output', default=os.path.join('ai', '29_model.ts'))
+    parser.add_argument('--onnx-output', default=os.path.join('ai', '29_model.onnx'))
+    parser.add_argument('--num-classes', type=int, default=11)
+    parser.add_argument('--opset', type=int, default=17)
+    args = parser.parse_args()
+
+    model = DETR(num_classes=args.num_classes, pretrained_backbone=False)
+    model.load_state_dict(torch.load(args.checkpoint, map_location='cpu'))
+    model.enable_inference_mode()
+
+    if args.format in ('torchscript', 'all'):
+        export_torchscript(model, args.torchscript_output)
+        print(f"✅ TorchScript model saved to {args.torchscript_output}")
+
+    if args.format in ('onnx', 'all'):
+        export_onnx(model, args.onnx_output, opset_version=args.opset)
+        print(f"✅ ONNX model saved to {args.onnx_output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Export SpeechT5 speaker x-vectors into a small local voice bundle (.npz).
+
+The TTS module loads this file (TTS_SPEAKERS_PATH) instead of pulling the
+whole CMU Arctic x-vector dataset at startup. The bundle holds
+``names`` (str, N) and ``xvectors`` (float32, N x 512); the first entry is
+the default voice.
+
+Run from the backend folder (needs `datasets` and network once):
+    python -m scripts.export_speakers
+    python -m scripts.export_speakers --voice default=7306 --voice deep=1138
+Without --voice, the current default (row 7306) is exported plus the first
+utterance of every other CMU Arctic speaker.
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+
+from config import Config
+
+DEFAULT_ROW = 7306
+
+
+def speaker_of(filename):
+    # e.g. "cmu_us_slt_arctic-wav-arctic_a0001" -> "slt"
+    parts = os.path.basename(filename).split('_')
+    return parts[2] if len(parts) > 2 else filename
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--voice', action='append', default=[], metavar='NAME=ROW',
+                        help='voice name and dataset row (repeatable; the first is the default)')
+    parser.add_argument('--out', default=Config.TTS_SPEAKERS_PATH)
+    args = parser.parse_args()
+
+    from datasets import load_dataset
+    dataset = load_dataset("Matthijs/cmu-arctic-xvectors", split="validation", trust_remote_code=True)
+
+    if args.voice:
+        rows = []
+        for spec in args.voice:
+            name, _, row = spec.partition('=')
+            rows.append((name, int(row)))
+    else:
+        rows = [('default', DEFAULT_ROW)]
+        seen = {speaker_of(dataset[DEFAULT_ROW]['filename'])}
+        for row, filename in enumerate(dataset['filename']):
+            speaker = speaker_of(filename)
+            if speaker not in seen:
+                seen.add(speaker)
+                rows.append((speaker, row))
+
+    names = np.array([name for name, _ in rows])
+    xvectors = np.stack([np.asarray(dataset[row]['xvector'], dtype=np.float32) for _, row in rows])
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    np.savez(args.out, names=names, xvectors=xvectors)
+    print(f"✅ Wrote {len(names)} voices ({', '.join(names)}) to {args.out} "
+          f"({os.path.getsize(args.out) / 1024:.1f} KiB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Helpers shared by the sign model scripts for reading sample frame folders."""
+import os
+
+import torch
+
+from ai.preprocess import FramePreprocessor
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp')
+
+
+def list_frames(folder, limit=None):
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(folder)
+        for name in names
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+    return paths[:limit] if limit else paths
+
+
+def load_tensors(paths, size=224):
+    """Decode and normalize frames exactly like SignDetector does, one (3, H, W) tensor each."""
+    preprocessor = FramePreprocessor(size=size, max_batch_size=1)
+    tensors = []
+    for path in paths:
+        with open(path, 'rb') as f:
+            frame = preprocessor.decode(f.read())
+        if frame is None:
+            print(f"⚠️ Skipping unreadable frame {path}")
+            continue
+        batch, _ = preprocessor([frame])
+        tensors.append(batch[0].clone())
+    return tensors
+
+
+def batched(tensors, batch_size):
+    for i in range(0, len(tensors), batch_size):
+        yield torch.stack(tensors[i:i + batch_size])
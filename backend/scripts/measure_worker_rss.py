@@ -0,0 +1,106 @@
+"""Measure per-worker memory with private-copy vs memory-mapped model weights.
+
+Starts N worker processes that each load the serving models the way a
+backend worker would, keeps them alive together, and reports RSS and PSS
+(proportional set size, which splits shared pages between the processes
+mapping them) per worker, first with private copies and then with mmap.
+
+Run from the backend folder (Linux, needs /proc):
+    MODEL_WEIGHTS_DIR=weights python -m scripts.measure_worker_rss --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+
+import torch
+
+
+def _memory_kb():
+    values = {}
+    with open('/proc/self/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0][:-1].lower()] = int(parts[1])
+    return values
+
+
+def _load_models(mmap, models, weights_dir):
+    from utils import weights
+    from transformers import SpeechT5ForTextToSpeech, SpeechT5HifiGan
+    from ai.model import DETR
+
+    loaded = []
+    if 'sign' in models:
+        detr = DETR(num_classes=11, pretrained_backbone=False)
+        path = os.path.join('ai', '29_model.pt')
+        if mmap:
+            weights.load_state_dict_mmap(detr, path)
+        else:
+            detr.load_state_dict(torch.load(path, map_location='cpu'))
+        loaded.append(detr)
+    if 'tts' in models:
+        if mmap:
+            loaded.append(weights.load_pretrained_mmap(SpeechT5ForTextToSpeech, "speecht5_tts"))
+            loaded.append(weights.load_pretrained_mmap(SpeechT5HifiGan, "speecht5_hifigan"))
+        else:
+            loaded.append(SpeechT5ForTextToSpeech.from_pretrained("microsoft/speecht5_tts", use_safetensors=True))
+            loaded.append(SpeechT5HifiGan.from_pretrained("microsoft/speecht5_hifigan"))
+    if 'stt' in models:
+        import whisper
+        loaded.append(weights.load_whisper_mmap("base") if mmap else whisper.load_model("base", device='cpu'))
+
+    if mmap and any(model is None for model in loaded):
+        raise RuntimeError(f"missing exports in {weights_dir}, run scripts.export_mmap_weights first")
+    return loaded
+
+
+def _worker(mmap, models, weights_dir, loaded_barrier, measured_barrier, results):
+    torch.set_num_threads(1)
+    models_in_memory = _load_models(mmap, models, weights_dir)
+    loaded_barrier.wait()  # every worker is resident before anyone measures
+    results.put(_memory_kb())
+    measured_barrier.wait()
+    del models_in_memory
+
+
+def measure(mmap, workers, models, weights_dir):
+    ctx = multiprocessing.get_context('spawn')
+    loaded_barrier, measured_barrier = ctx.Barrier(workers), ctx.Barrier(workers)
+    results = ctx.Queue()
+    processes = [
+        ctx.Process(target=_worker, args=(mmap, models, weights_dir, loaded_barrier, measured_barrier, results))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    samples = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--models', default='sign,tts,stt', help='comma separated subset of sign,tts,stt')
+    args = parser.parse_args()
+
+    weights_dir = os.environ.get('MODEL_WEIGHTS_DIR')
+    if not weights_dir:
+        print("❌ Set MODEL_WEIGHTS_DIR to the folder written by scripts.export_mmap_weights")
+        return 1
+    models = set(args.models.split(','))
+
+    print(f"{'mode':<8} | {'RSS/worker':>12} | {'PSS/worker':>12} | {'PSS total':>10}")
+    for mmap in (False, True):
+        samples = measure(mmap, args.workers, models, weights_dir)
+        rss = sum(s['rss'] for s in samples) / len(samples) / 1024
+        pss = sum(s['pss'] for s in samples) / len(samples) / 1024
+        print(f"{'mmap' if mmap else 'copy':<8} | {rss:>9.0f} MB | {pss:>9.0f} MB | {pss * len(samples):>7.0f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""Build the INT8 CPU variant of the sign language DETR checkpoint.
+
+Run from the backend folder:
+    python -m scripts.quantize_sign_model --calibration-dir samples/frames
+then serve it with SIGN_MODEL_VARIANT=int8.
+"""
+import argparse
+import os
+import sys
+
+import torch
+
+from ai.model import DETR
+from ai.quantization import quantize_detr, save_quantized_detr, default_engine
+from scripts.frames import list_frames, load_tensors, batched
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--checkpoint', default=os.path.join('ai', '29_model.pt'))
+    parser.add_argument('--output', default=os.path.join('ai', '29_model_int8.pt'))
+    parser.add_argument('--calibration-dir', required=True,
+                        help='folder of representative camera frames (jpg/png)')
+    parser.add_argument('--max-frames', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=8)
+    parser.add_argument('--num-classes', type=int, default=11)
+    parser.add_argument('--engine', default=default_engine())
+    args = parser.parse_args()
+
+    paths = list_frames(args.calibration_dir, limit=args.max_frames)
+    if not paths:
+        print(f"❌ No calibration frames found in {args.calibration_dir}")
+        return 1
+
+    model = DETR(num_classes=args.num_classes, pretrained_backbone=False)
+    model.load_state_dict(torch.load(args.checkpoint, map_location='cpu'))
+    model.eval()
+
+    print(f"⏳ Calibrating on {len(paths)} frames ({args.engine})...")
+    tensors = load_tensors(paths)
+    quantize_detr(model, batched(tensors, args.batch_size), engine=args.engine)
+
+    save_quantized_detr(model, args.output, num_classes=args.num_classes)
+    size_mb = os.path.getsize(args.output) / 1e6
+    print(f"✅ INT8 model saved to {args.output} ({size_mb:.1f} MB)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""Compare the INT8 sign model against fp32: top-1 label agreement and latency.
+
+Run from the backend folder:
+    python -m scripts.sign_parity --frames samples/frames
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import torch
+
+from ai.model import DETR
+from ai.quantization import load_quantized_detr
+from scripts.frames import list_frames, load_tensors
+
+CONFIDENCE_THRESHOLD = 0.8
+
+
+def top1(logits):
+    """(class id of the most confident query, its probability) for one frame."""
+    probabilities = logits.softmax(-1)[:, :-1]
+    max_probs, max_classes = probabilities.max(-1)
+    best_idx = max_probs.argmax()
+    return max_classes[best_idx].item(), max_probs[best_idx].item()
+
+
+def run(model, tensors):
+    predictions, latencies = [], []
+    with torch.inference_mode():
+        model(tensors[0].unsqueeze(0), return_boxes=False)  # warm-up
+        for tensor in tensors:
+            start = time.perf_counter()
+            logits = model(tensor.unsqueeze(0), return_boxes=False)['pred_logits'][0]
+            latencies.append((time.perf_counter() - start) * 1000.0)
+            predictions.append(top1(logits))
+    return predictions, latencies
+
+
+def describe(latencies):
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    return f"mean {statistics.mean(latencies):.1f} ms, p95 {p95:.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', required=True, help='folder of sample frames (jpg/png)')
+    parser.add_argument('--fp32', default=os.path.join('ai', '29_model.pt'))
+    parser.add_argument('--int8', default=os.path.join('ai', '29_model_int8.pt'))
+    parser.add_argument('--num-classes', type=int, default=11)
+    parser.add_argument('--threads', type=int, default=None)
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    tensors = load_tensors(list_frames(args.frames))
+    if not tensors:
+        print(f"❌ No frames found in {args.frames}")
+        return 1
+
+    fp32 = DETR(num_classes=args.num_classes, pretrained_backbone=False)
+    fp32.load_state_dict(torch.load(args.fp32, map_location='cpu'))
+    fp32.enable_inference_mode()
+    int8 = load_quantized_detr(args.int8, num_classes=args.num_classes).enable_inference_mode()
+
+    fp32_preds, fp32_latency = run(fp32, tensors)
+    int8_preds, int8_latency = run(int8, tensors)
+
+    # Raw agreement on the most confident query, and agreement on what the
+    # user would actually see after the 0.8 confidence threshold.
+    def label(pred):
+        class_id, prob = pred
+        return class_id if prob > CONFIDENCE_THRESHOLD else None
+
+    n = len(tensors)
+    raw = sum(a[0] == b[0] for a, b in zip(fp32_preds, int8_preds)) / n
+    shown = sum(label(a) == label(b) for a, b in zip(fp32_preds, int8_preds)) / n
+
+    print(f"Frames: {n}")
+    print(f"Top-1 agreement (raw):        {raw:.1%}")
+    print(f"Label agreement (thresholded): {shown:.1%}")
+    print(f"fp32 latency: {describe(fp32_latency)}")
+    print(f"int8 latency: {describe(int8_latency)}")
+    print(f"Speed-up: {statistics.mean(fp32_latency) / statistics.mean(int8_latency):.2f}x")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""Preforking production launcher.
+
+The master process imports every model module, loads and warms the models
+once, opens the listening socket and then forks SERVER_WORKERS workers.
+The children inherit the loaded weights copy-on-write (nothing writes to
+them at inference time, so the pages stay shared), and each pins torch to
+its share of the cores so N workers don't oversubscribe the host.
+
+    python serve.py --workers 4 --port 5001
+
+Notes for more than one worker:
+- SOCKETIO_MESSAGE_QUEUE must point at a Redis (or other kombu) broker so
+  an emit from one worker reaches a socket held by another.
+- The frontend connects with the websocket transport only, so each session
+  stays on the worker that accepted its connection.
+- The online user list is moved into a multiprocessing.Manager dict that
+  every worker sees.
+- With SIGN_WORKERS > 0 the detection pool is not forked; each worker
+  starts its own pool after the fork, and the pools split the cores
+  between them (cores / (workers x SIGN_WORKERS) threads per detector).
+- STT engines whose runtime does not survive fork() (faster-whisper) are
+  loaded by each worker instead.
+
+`python app.py` is still the single-process development server.
+"""
+import argparse
+import os
+import signal
+import sys
+
+import torch
+from config import Config
+
+
+def _load_models():
+    # Import every module that registers a model, then load them all here
+    # so the workers start with warm weights.
+    import routes.socket_routes  # noqa: F401  sign detector, TTS
+    import routes.stt_routes  # noqa: F401
+    from routes.stt_engines import ENGINES
+    from utils.model_manager import model_manager
+
+    stt_engine = ENGINES.get(Config.STT_ENGINE)
+    names = [name for name in model_manager.status()
+             if not (name == 'sign' and Config.SIGN_WORKERS)
+             and not (name == 'stt' and stt_engine is not None and not stt_engine.fork_safe)]
+    model_manager.start(*names)
+    for name in names:
+        try:
+            model_manager.get(name)
+        except Exception as e:
+            print(f"⚠️ {name} not preloaded: {e}")
+
+
+def _share_online_users():
+    import multiprocessing
+    from routes import socket_routes
+
+    manager = multiprocessing.Manager()
+    socket_routes.online_users = manager.dict()
+    return manager
+
+
+def _worker(listener, threads):
+    torch.set_num_threads(threads)
+
+    import eventlet.wsgi
+    from app import create_app
+
+    app = create_app()
+    print(f"✅ Worker {os.getpid()} serving ({threads} torch threads)")
+    eventlet.wsgi.server(listener, app, log_output=False)
+
+
+def _spawn(listener, threads):
+    pid = os.fork()
+    if pid == 0:
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        try:
+            _worker(listener, threads)
+            os._exit(0)
+        except BaseException as e:
+            print(f"❌ Worker {os.getpid()} crashed: {e}")
+            os._exit(1)
+    return pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', 5001)))
+    parser.add_argument('--workers', type=int, default=Config.SERVER_WORKERS)
+    parser.add_argument('--threads', type=int, default=Config.SERVER_WORKER_THREADS,
+                        help='torch intra-op threads per worker (0 = cores / workers)')
+    args = parser.parse_args()
+
+    workers = max(1, args.workers)
+    # Per-process thread shares (e.g. the sign worker pools) use the CLI value
+    Config.SERVER_WORKERS = workers
+    threads = args.threads or max(1, (os.cpu_count() or 1) // workers)
+    if workers > 1 and not Config.SOCKETIO_MESSAGE_QUEUE:
+        print("❌ SERVER_WORKERS > 1 needs SOCKETIO_MESSAGE_QUEUE so workers can reach each other's sockets")
+        return 1
+
+    # Load single-threaded: an OpenMP pool started in the master does not
+    # survive fork(), and the workers set their own thread counts anyway.
+    torch.set_num_threads(1)
+    torch.set_num_interop_threads(1)
+    print(f"🔄 Loading models before forking {workers} workers...")
+    _load_models()
+    manager = _share_online_users() if workers > 1 else None
+
+    import eventlet
+    listener = eventlet.listen((args.host, args.port))
+    print(f"✅ Listening on {args.host}:{args.port}")
+
+    children = {_spawn(listener, threads) for _ in range(workers)}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, stop)
+    signal.signal(signal.SIGTERM, stop)
+
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        if pid not in children: continue  # the Manager process
+        children.discard(pid)
+        if not stopping:
+            print(f"⚠️ Worker {pid} exited (status {status}), restarting")
+            children.add(_spawn(listener, threads))
+
+    if manager is not None:
+        manager.shutdown()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
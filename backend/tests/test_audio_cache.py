@@ -0,0 +1,42 @@
+import os
+
+from utils.audio_cache import AudioCache
+
+
+def _files(directory):
+    return sorted(name for _, _, names in os.walk(directory) for name in names)
+
+
+def test_memory_only_entries_never_reach_disk(tmp_path):
+    cache = AudioCache(1024, str(tmp_path))
+    cache.put(AudioCache.key("typed text"), b"audio", persist=False)
+
+    assert cache.get(AudioCache.key("typed text")) == b"audio"
+    assert _files(tmp_path) == []
+
+
+def test_disk_tier_evicts_least_recently_used(tmp_path):
+    cache = AudioCache(0, str(tmp_path), max_disk_bytes=250)
+    keys = [AudioCache.key(label) for label in ("hello", "book", "please")]
+    cache.put(keys[0], b"a" * 100)
+    cache.put(keys[1], b"b" * 100)
+    assert cache.get(keys[0]) == b"a" * 100  # disk hit refreshes "hello"
+    cache.put(keys[2], b"c" * 100)
+
+    assert cache.get(keys[1]) is None
+    assert cache.get(keys[0]) == b"a" * 100
+    assert cache.get(keys[2]) == b"c" * 100
+    stats = cache.stats()
+    assert stats["disk_entries"] == 2 and stats["disk_bytes"] == 200
+    assert stats["disk_evictions"] == 1
+
+
+def test_disk_index_survives_restart_and_applies_a_lower_cap(tmp_path):
+    cache = AudioCache(0, str(tmp_path), max_disk_bytes=1000)
+    for label in ("hello", "book", "please"):
+        cache.put(AudioCache.key(label), label.encode() * 10)
+
+    reopened = AudioCache(0, str(tmp_path), max_disk_bytes=100)
+
+    assert reopened.stats()["disk_bytes"] <= 100
+    assert len(_files(tmp_path)) == reopened.stats()["disk_entries"]
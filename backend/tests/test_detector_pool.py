@@ -0,0 +1,43 @@
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('cv2')
+pytest.importorskip('flask_socketio')
+eventlet = pytest.importorskip('eventlet')
+
+from extensions import socketio
+from routes import detector_pool
+from routes.detector_pool import SignWorkerPool
+from utils.model_manager import ModelManager
+
+
+def _fake_worker(shm_name, ring_shape, conn, threads):
+    # Stands in for _worker_main without loading the model
+    conn.send(('ready', None, True))
+    while True:
+        message = conn.recv()
+        if message is None: break
+        slot, count = message
+        conn.send(('result', slot, ['hello'] * count))
+
+
+def test_pool_loads_on_a_loader_thread_under_eventlet(monkeypatch):
+    monkeypatch.setattr(detector_pool, '_worker_main', _fake_worker)
+    monkeypatch.setattr(socketio, 'async_mode', 'eventlet', raising=False)
+    pool = SignWorkerPool(workers=2, threads=1, slots_per_worker=2, max_batch_size=4)
+    pool.preprocessor = lambda frames, out: (out, list(range(len(frames))))
+
+    manager = ModelManager()
+    manager.register('sign', pool.load)
+    manager.start('sign')
+    try:
+        # Keep the hub running while the loader thread waits for the workers
+        for _ in range(600):
+            if manager.is_ready('sign'): break
+            eventlet.sleep(0.05)
+        assert manager.status()['sign']['state'] == 'ready'
+
+        predictions = [eventlet.spawn(pool.predict_frames, [object()] * 6) for _ in range(3)]
+        assert [green.wait() for green in predictions] == [['hello'] * 6] * 3
+    finally:
+        pool.shutdown()
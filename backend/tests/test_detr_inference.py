@@ -0,0 +1,30 @@
+import copy
+
+import pytest
+
+torch = pytest.importorskip('torch')
+pytest.importorskip('torchvision')
+
+from ai.model import DETR
+
+
+@pytest.fixture(scope='module')
+def model():
+    torch.manual_seed(0)
+    return DETR(num_classes=11, pretrained_backbone=False).eval()
+
+
+@pytest.mark.parametrize('channels_last', [False, True])
+def test_inference_mode_matches_regular_forward(model, channels_last):
+    inputs = torch.randn(4, 3, 224, 224)
+    with torch.no_grad():
+        reference = model(inputs)
+
+    fast = copy.deepcopy(model).enable_inference_mode(channels_last=channels_last)
+    with torch.inference_mode():
+        # Run twice so the cached positional encoding is exercised too
+        fast(inputs, return_boxes=False)
+        outputs = fast(inputs, return_boxes=False)
+
+    assert 'pred_boxes' not in outputs
+    assert torch.allclose(outputs['pred_logits'], reference['pred_logits'], atol=1e-4, rtol=0)
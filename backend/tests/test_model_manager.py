@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+from utils.model_manager import ModelManager, ModelUnavailable
+
+
+def test_warmup_receives_loaded_model_and_reaches_ready():
+    manager = ModelManager()
+    warmed = []
+    manager.register('tts', lambda: {'model': 'loaded'}, warmup=warmed.append)
+
+    manager.start('tts')
+
+    assert manager.get('tts', timeout=2) == {'model': 'loaded'}
+    assert warmed == [{'model': 'loaded'}]
+    assert manager.status()['tts']['state'] == 'ready'
+
+
+def test_warmup_calling_get_fails_instead_of_deadlocking():
+    manager = ModelManager()
+    errors = []
+
+    def warmup(model):
+        try:
+            manager.get('tts')
+        except ModelUnavailable as e:
+            errors.append(e)
+            raise
+
+    manager.register('tts', lambda: 'bundle', warmup=warmup)
+    manager.start('tts')
+
+    assert manager.get('tts', timeout=2) == 'bundle'
+    assert manager.is_ready('tts')
+    assert len(errors) == 1
+
+
+def test_lazy_get_runs_warmup_on_calling_thread():
+    manager = ModelManager()
+    threads = []
+    manager.register('stt', lambda: 'model', warmup=lambda model: threads.append(threading.get_ident()))
+
+    assert manager.get('stt', timeout=2) == 'model'
+    assert threads == [threading.get_ident()]
+    assert manager.ready()
+
+
+def test_failed_loader_is_reported():
+    manager = ModelManager()
+
+    def loader():
+        raise RuntimeError("no weights")
+
+    manager.register('sign', loader)
+
+    with pytest.raises(ModelUnavailable, match="no weights"):
+        manager.get('sign', timeout=2)
+    assert manager.status()['sign']['state'] == 'failed'
@@ -0,0 +1,55 @@
+import pytest
+
+cv2 = pytest.importorskip('cv2')
+torch = pytest.importorskip('torch')
+A = pytest.importorskip('albumentations')
+
+import numpy as np
+from albumentations.pytorch import ToTensorV2
+
+from ai.preprocess import FramePreprocessor, IMAGENET_MEAN, IMAGENET_STD
+
+
+def _jpeg(width, height, seed=0):
+    # Smooth synthetic frame so the JPEG looks like camera footage, not noise
+    rng = np.random.default_rng(seed)
+    small = rng.integers(0, 256, size=(height // 16 + 1, width // 16 + 1, 3), dtype=np.uint8)
+    frame = cv2.resize(small, (width, height), interpolation=cv2.INTER_CUBIC)
+    ok, encoded = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 50])
+    assert ok
+    return encoded.tobytes()
+
+
+def _albumentations(image_bytes):
+    # The pre-FramePreprocessor path: imdecode -> cvtColor -> Compose -> unsqueeze
+    transform = A.Compose([
+        A.Resize(224, 224),
+        A.Normalize(mean=IMAGENET_MEAN, std=IMAGENET_STD),
+        ToTensorV2()
+    ])
+    frame = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    return transform(image=cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))['image'].unsqueeze(0)
+
+
+@pytest.mark.parametrize('width, height', [(320, 240), (640, 480), (1280, 720)])
+def test_fused_preprocessing_matches_albumentations(width, height):
+    image_bytes = _jpeg(width, height)
+    # Reduced-scale decoding is lossy by design (libjpeg DCT scaling), so
+    # only the full-scale path has to match the reference
+    preprocessor = FramePreprocessor(size=224, max_batch_size=1, reduced_decode=False)
+
+    batch, indices = preprocessor([preprocessor.decode(image_bytes)])
+
+    assert indices == [0]
+    assert torch.allclose(batch, _albumentations(image_bytes), atol=1e-4, rtol=0)
+
+
+@pytest.mark.parametrize('width, height', [(640, 480), (1280, 720)])
+def test_reduced_decode_keeps_the_batch_layout(width, height):
+    preprocessor = FramePreprocessor(size=224, max_batch_size=1, reduced_decode=True)
+
+    batch, indices = preprocessor([preprocessor.decode(_jpeg(width, height))])
+
+    assert indices == [0]
+    assert batch.shape == (1, 3, 224, 224)
+    assert torch.isfinite(batch).all()
@@ -0,0 +1,45 @@
+import pytest
+
+torch = pytest.importorskip('torch')
+pytest.importorskip('torchvision')
+
+from ai.model import DETR
+from ai.backends import (EagerBackend, TorchScriptBackend, OnnxRuntimeBackend,
+                         export_torchscript, export_onnx)
+
+
+@pytest.fixture(scope='module')
+def model():
+    torch.manual_seed(0)
+    return DETR(num_classes=11, pretrained_backbone=False).enable_inference_mode()
+
+
+@pytest.fixture(scope='module')
+def inputs():
+    return torch.randn(8, 3, 224, 224, generator=torch.Generator().manual_seed(1))
+
+
+def _assert_matches_eager(backend, model, inputs):
+    eager = EagerBackend(model)
+    # The exports are traced at batch 1 and must keep a dynamic batch axis
+    for batch_size in (1, inputs.shape[0]):
+        batch = inputs[:batch_size]
+        logits, reference = backend(batch), eager(batch)
+        assert logits.shape == reference.shape
+        assert torch.allclose(logits, reference, atol=1e-3, rtol=0)
+
+
+def test_torchscript_matches_eager(model, inputs, tmp_path):
+    path = str(tmp_path / 'model.ts')
+    export_torchscript(model, path)
+
+    _assert_matches_eager(TorchScriptBackend(path), model, inputs)
+
+
+def test_onnx_runtime_matches_eager(model, inputs, tmp_path):
+    pytest.importorskip('onnx')
+    pytest.importorskip('onnxruntime')
+    path = str(tmp_path / 'model.onnx')
+    export_onnx(model, path)
+
+    _assert_matches_eager(OnnxRuntimeBackend(path), model, inputs)
@@ -0,0 +1,29 @@
+import subprocess
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+class AudioDecodeError(Exception):
+    """Raised when ffmpeg cannot decode an uploaded clip."""
+
+
+def decode_audio(data, sample_rate=SAMPLE_RATE):
+    """Decode an encoded clip (webm/opus, wav, ogg, ...) held in memory.
+
+    The bytes go to ffmpeg on stdin and come back as mono 16-bit PCM on
+    stdout, so nothing touches the disk and the clip is decoded exactly
+    once. Returns float32 samples in [-1, 1), the array Whisper expects.
+    """
+    cmd = [
+        "ffmpeg", "-threads", "0",
+        "-i", "pipe:0",
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sample_rate),
+        "-loglevel", "error",
+        "pipe:1",
+    ]
+    try:
+        result = subprocess.run(cmd, input=data, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
+    except subprocess.CalledProcessError as e:
+        raise AudioDecodeError(e.stderr.decode(errors='replace').strip() or "ffmpeg failed") from e
+    return np.frombuffer(result.stdout, np.int16).astype(np.float32) / 32768.0
@@ -0,0 +1,204 @@
+import hashlib
+import os
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+
+
+def normalize_text(text):
+    """Canonical form of a TTS request: NFKC, single spaces, no outer whitespace."""
+    return " ".join(unicodedata.normalize('NFKC', text or '').split())
+
+
+class AudioCache:
+    """Content-addressed cache of rendered audio, in memory and on disk.
+
+    Keys are a SHA-256 over everything that determines the output (text,
+    speaker embedding bytes, model version, ...), so entries never go stale:
+    changing any input simply produces a new key. The memory tier is an LRU
+    bounded by total bytes; the disk tier (``directory``, optional) keeps one
+    file per key and survives restarts. A disk hit is promoted into memory.
+
+    Only entries put with ``persist=True`` reach the disk, and the disk tier
+    is an LRU too: once its files exceed ``max_disk_bytes`` the least
+    recently used are deleted (reads refresh a file's mtime, which orders
+    the index rebuilt at start-up). Processes sharing the folder each keep
+    their own index, so the cap is approximate across them.
+    """
+
+    def __init__(self, max_bytes, directory=None, suffix='.wav', max_disk_bytes=0):
+        self.max_bytes = max(0, max_bytes)
+        self.directory = directory or None
+        self.suffix = suffix
+        self.max_disk_bytes = max(0, max_disk_bytes)
+
+        self._entries = OrderedDict()
+        self._bytes = 0
+        # key -> file size, least recently used first
+        self._disk = OrderedDict()
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_evictions = 0
+        self.disk_errors = 0
+
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+            self._scan()
+
+    @staticmethod
+    def key(*parts):
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode('utf-8')
+            digest.update(len(part).to_bytes(8, 'little'))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], key + self.suffix)
+
+    def get(self, key):
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return data
+
+        data = self._read(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+            self._forget(key)
+            self._disk[key] = len(data)  # most recently used
+            self._disk_bytes += len(data)
+        return data
+
+    def put(self, key, data, persist=True):
+        """Cache ``data``; ``persist=False`` keeps it in memory only."""
+        with self._lock:
+            self._remember(key, data)
+        if persist:
+            self._write(key, data)
+
+    def _remember(self, key, data):
+        # call with the lock held
+        if len(data) > self.max_bytes: return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = data
+        self._bytes += len(data)
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+            self.evictions += 1
+
+    def _read(self, key):
+        if not self.directory: return None
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            with self._lock:
+                self._forget(key)  # deleted by another process sharing the folder
+            return None
+        except OSError as e:
+            self.disk_errors += 1
+            print(f"⚠️ Audio cache read failed: {e}")
+            return None
+        try:
+            os.utime(path)  # recently used, for the index rebuilt at start-up
+        except OSError:
+            pass
+        return data
+
+    def _write(self, key, data):
+        if not self.directory or len(data) > self.max_disk_bytes: return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # write then rename, so a crash never leaves a truncated entry
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            self.disk_errors += 1
+            print(f"⚠️ Audio cache write failed: {e}")
+            return
+
+        with self._lock:
+            self._forget(key)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+        self._evict_disk()
+
+    def _evict_disk(self):
+        evicted = []
+        with self._lock:
+            while self._disk_bytes > self.max_disk_bytes:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+                self.disk_evictions += 1
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                self.disk_errors += 1
+                print(f"⚠️ Audio cache eviction failed: {e}")
+
+    def _forget(self, key):
+        # call with the lock held
+        size = self._disk.pop(key, None)
+        if size is not None:
+            self._disk_bytes -= size
+
+    def _scan(self):
+        # Rebuild the disk index from the files left by earlier runs, oldest first
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(self.suffix): continue
+                try:
+                    info = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                files.append((info.st_mtime, name[:-len(self.suffix)], info.st_size))
+        for _, key, size in sorted(files):
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._evict_disk()  # the cap may have been lowered since
+
+    def stats(self):
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "disk_errors": self.disk_errors,
+            "memory_entries": len(self._entries),
+            "memory_bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "disk": bool(self.directory),
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes,
+            "disk_evictions": self.disk_evictions,
+        }
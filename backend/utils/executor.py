@@ -0,0 +1,109 @@
+import threading
+import time
+from extensions import socketio
+from config import Config
+
+
+class ExecutorBusy(Exception):
+    """Raised when a model's wait queue is full; callers should shed the request."""
+
+
+class _Lane:
+    def __init__(self, name, concurrency, max_queue, semaphore):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.semaphore = semaphore
+
+        self.waiting = 0
+        self.active = 0
+        self.completed = 0
+        self.rejected = 0
+        self.wait_ms_total = 0.0
+        self.wait_ms_max = 0.0
+        self.run_ms_total = 0.0
+
+    def stats(self):
+        done = self.completed
+        return {
+            "concurrency": self.concurrency,
+            "max_queue": self.max_queue,
+            "active": self.active,
+            "queue_depth": self.waiting,
+            "completed": done,
+            "rejected": self.rejected,
+            "wait_ms_avg": round(self.wait_ms_total / done, 2) if done else 0.0,
+            "wait_ms_max": round(self.wait_ms_max, 2),
+            "run_ms_avg": round(self.run_ms_total / done, 2) if done else 0.0,
+        }
+
+
+class ModelExecutor:
+    """Runs blocking model calls without stalling the Socket.IO event loop.
+
+    Every call is tagged with a model name ('sign', 'tts', 'stt', ...). Each
+    model gets its own lane with a concurrency limit and a bounded number of
+    waiting callers; beyond that ``ExecutorBusy`` is raised. Under eventlet
+    the call itself runs in eventlet's native thread pool (``tpool``) so other
+    green threads keep running; in threading mode the caller already is a
+    real thread and runs it directly.
+    """
+
+    def __init__(self):
+        self._lanes = {}
+        self._lock = threading.Lock()
+
+    def _eventlet(self):
+        return getattr(socketio, 'async_mode', None) == 'eventlet'
+
+    def _lane(self, name):
+        lane = self._lanes.get(name)
+        if lane is not None: return lane
+
+        with self._lock:
+            if name not in self._lanes:
+                limits = Config.MODEL_CONCURRENCY.get(name, 1), Config.MODEL_QUEUE_LIMIT.get(name, 32)
+                concurrency, max_queue = max(1, limits[0]), max(0, limits[1])
+                if self._eventlet():
+                    from eventlet.semaphore import Semaphore
+                    semaphore = Semaphore(concurrency)
+                else:
+                    semaphore = threading.BoundedSemaphore(concurrency)
+                self._lanes[name] = _Lane(name, concurrency, max_queue, semaphore)
+            return self._lanes[name]
+
+    def run(self, name, fn, *args, **kwargs):
+        lane = self._lane(name)
+        if lane.waiting >= lane.max_queue and lane.active >= lane.concurrency:
+            lane.rejected += 1
+            raise ExecutorBusy(f"{name} queue is full ({lane.waiting} waiting)")
+
+        queued_at = time.monotonic()
+        lane.waiting += 1
+        try:
+            lane.semaphore.acquire()
+        finally:
+            lane.waiting -= 1
+
+        started_at = time.monotonic()
+        wait_ms = (started_at - queued_at) * 1000.0
+        lane.active += 1
+        try:
+            if self._eventlet():
+                from eventlet import tpool
+                return tpool.execute(fn, *args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            lane.active -= 1
+            lane.completed += 1
+            lane.wait_ms_total += wait_ms
+            lane.wait_ms_max = max(lane.wait_ms_max, wait_ms)
+            lane.run_ms_total += (time.monotonic() - started_at) * 1000.0
+            lane.semaphore.release()
+
+    def stats(self):
+        return {name: lane.stats() for name, lane in self._lanes.items()}
+
+
+# Singleton Instance
+model_executor = ModelExecutor()
@@ -0,0 +1,250 @@
+import queue
+import threading
+import time
+from collections import OrderedDict, deque
+from extensions import socketio
+from config import Config
+from utils.executor import model_executor, ExecutorBusy
+
+
+class JobCancelled(Exception):
+    """Raised by MicroBatcher.submit when the job's group was cancelled."""
+
+
+class JobGroup:
+    """Cancellation scope for batcher jobs (e.g. one socket's TTS within a call)."""
+
+    def __init__(self, name=None):
+        self.name = name
+        self.cancelled = False
+
+
+class _Request:
+    def __init__(self, item, done, priority, owner, group):
+        self.item = item
+        self.done = done
+        self.priority = priority
+        self.owner = owner
+        self.group = group
+        self.submitted_at = time.monotonic()
+
+
+class MicroBatcher:
+    """Turns concurrent single-item calls into batched model calls.
+
+    ``submit(item)`` blocks the calling (green) thread and returns the
+    result for that item. Requests are gathered for ``window_ms`` after the
+    first one arrives (or until ``max_batch_size``), then
+    ``batch_fn(items) -> results`` runs once on the model executor lane
+    ``name``, so it shares that lane's concurrency and queue limits. Up to
+    ``concurrency`` batches are in flight; requests arriving meanwhile form
+    the next batch. An exception from ``batch_fn`` (or ExecutorBusy) is
+    raised in every caller of that batch.
+
+    Pending requests are scheduled rather than FIFO: a lower ``priority``
+    always goes first, and within a priority the ``owner``s (e.g. users) take
+    turns, so one owner with many requests cannot starve the others.
+    ``cancel(group)`` fails that group's pending requests with JobCancelled,
+    and requests of a cancelled group that were already running get
+    JobCancelled instead of their result.
+
+    At most ``max_pending`` requests wait (by default the lane's
+    MODEL_QUEUE_LIMIT); beyond that ``submit`` raises ExecutorBusy, since
+    the lane itself only ever sees ``concurrency`` batch callers.
+
+    Works under the Socket.IO async mode once the app is initialised, and
+    with plain threads otherwise (scripts, tests).
+    """
+
+    def __init__(self, name, batch_fn, window_ms=20, max_batch_size=8, concurrency=1, max_pending=None):
+        self.name = name
+        self.batch_fn = batch_fn
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+        self.concurrency = max(1, concurrency)
+        if max_pending is None:
+            max_pending = Config.MODEL_QUEUE_LIMIT.get(name, 32)
+        self.max_pending = max(1, max_pending)
+
+        # priority -> owner -> deque of requests (owners in round-robin order)
+        self._pending = {}
+        self._pending_count = 0
+        self._lock = threading.Lock()
+        # one token per submitted request; wakes the batching loop
+        self._wake = None
+        self._empty = None
+        self._capacity = None
+        self._start_lock = threading.Lock()
+
+        self.requests = 0
+        self.batches = 0
+        self.failed_batches = 0
+        self.cancelled = 0
+        self.rejected = 0
+        # priority -> [count, total ms, max ms] of time spent queued
+        self._queue_ms = {}
+
+    def _create_queue(self):
+        if socketio.server is not None:
+            return socketio.server.eio.create_queue()
+        return queue.Queue()
+
+    def start(self):
+        """Start the background batching loop (idempotent)."""
+        if self._wake is not None: return
+        with self._start_lock:
+            if self._wake is not None: return
+
+            if socketio.server is not None:
+                self._empty = socketio.server.eio.get_queue_empty_exception()
+            else:
+                self._empty = queue.Empty
+            self._capacity = self._create_queue()
+            for _ in range(self.concurrency):
+                self._capacity.put(None)
+            self._wake = self._create_queue()
+            self._spawn(self._run)
+
+    def _spawn(self, fn, *args):
+        if socketio.server is not None:
+            socketio.start_background_task(fn, *args)
+        else:
+            threading.Thread(target=fn, args=args, daemon=True).start()
+
+    def submit(self, item, priority=0, owner=None, group=None):
+        if group is not None and group.cancelled:
+            raise JobCancelled(f"{self.name} job group {group.name} was cancelled")
+        self.start()
+
+        request = _Request(item, self._create_queue(), priority, owner, group)
+        with self._lock:
+            if self._pending_count >= self.max_pending:
+                self.rejected += 1
+                raise ExecutorBusy(f"{self.name} batcher is full ({self._pending_count} pending)")
+            owners = self._pending.setdefault(priority, OrderedDict())
+            owners.setdefault(owner, deque()).append(request)
+            self._pending_count += 1
+        self._wake.put(None)
+
+        ok, value = request.done.get()
+        if not ok: raise value
+        return value
+
+    def cancel(self, group):
+        """Cancel every pending (and future) request of ``group``."""
+        group.cancelled = True
+        removed = []
+        with self._lock:
+            for owners in self._pending.values():
+                for owner, requests in list(owners.items()):
+                    if not any(request.group is group for request in requests): continue
+                    removed.extend(request for request in requests if request.group is group)
+                    kept = deque(request for request in requests if request.group is not group)
+                    if kept:
+                        owners[owner] = kept
+                    else:
+                        del owners[owner]
+            self._pending_count -= len(removed)
+            self.cancelled += len(removed)
+
+        for request in removed:
+            request.done.put((False, JobCancelled(f"{self.name} job group {group.name} was cancelled")))
+        return len(removed)
+
+    def stats(self):
+        done = self.requests
+        total_ms = sum(entry[1] for entry in self._queue_ms.values())
+        return {
+            "requests": done,
+            "batches": self.batches,
+            "failed_batches": self.failed_batches,
+            "cancelled": self.cancelled,
+            "rejected": self.rejected,
+            "avg_batch_size": round(done / self.batches, 2) if self.batches else 0.0,
+            "queue_ms_avg": round(total_ms / done, 2) if done else 0.0,
+            "queue_ms_max": round(max((entry[2] for entry in self._queue_ms.values()), default=0.0), 2),
+            "queue_ms_by_priority": {
+                str(priority): {"count": count, "avg": round(total / count, 2), "max": round(peak, 2)}
+                for priority, (count, total, peak) in sorted(self._queue_ms.items())
+            },
+            "pending": self._pending_count,
+            "max_pending": self.max_pending,
+        }
+
+    def _pop(self):
+        # call with the lock held
+        for priority in sorted(self._pending):
+            owners = self._pending[priority]
+            if not owners: continue
+            owner, requests = next(iter(owners.items()))
+            request = requests.popleft()
+            if requests:
+                owners.move_to_end(owner)  # next owner's turn
+            else:
+                del owners[owner]
+            self._pending_count -= 1
+            return request
+        return None
+
+    def _next(self, timeout=None):
+        # Tokens of cancelled requests wake the loop without a request; skip them
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise self._empty()
+            self._wake.get(timeout=remaining)
+            with self._lock:
+                request = self._pop()
+            if request is not None:
+                return request
+
+    def _collect(self):
+        batch = [self._next()]
+        deadline = time.monotonic() + self.window
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0: break
+            try:
+                batch.append(self._next(timeout=remaining))
+            except self._empty:
+                break
+        return batch
+
+    def _process(self, batch):
+        now = time.monotonic()
+        for request in batch:
+            queue_ms = (now - request.submitted_at) * 1000.0
+            entry = self._queue_ms.setdefault(request.priority, [0, 0.0, 0.0])
+            entry[0] += 1
+            entry[1] += queue_ms
+            entry[2] = max(entry[2], queue_ms)
+        self.requests += len(batch)
+        self.batches += 1
+
+        try:
+            results = model_executor.run(self.name, self.batch_fn, [request.item for request in batch])
+            if len(results) != len(batch):
+                raise RuntimeError(f"{self.name} batch returned {len(results)} results for {len(batch)} items")
+            outcomes = [(True, result) for result in results]
+        except Exception as e:
+            self.failed_batches += 1
+            outcomes = [(False, e)] * len(batch)
+        finally:
+            self._capacity.put(None)
+
+        for request, outcome in zip(batch, outcomes):
+            if request.group is not None and request.group.cancelled:
+                self.cancelled += 1
+                outcome = (False, JobCancelled(f"{self.name} job group {request.group.name} was cancelled"))
+            request.done.put(outcome)
+
+    def _run(self):
+        while True:
+            self._capacity.get()
+            batch = self._collect()
+            if self.concurrency == 1:
+                self._process(batch)
+            else:
+                self._spawn(self._process, batch)
@@ -0,0 +1,112 @@
+import threading
+import time
+
+
+class ModelUnavailable(Exception):
+    """Raised by ModelManager.get when a model failed to load."""
+
+
+class _Entry:
+    def __init__(self, name, loader, warmup):
+        self.name = name
+        self.loader = loader
+        self.warmup = warmup
+
+        self.state = 'pending'  # pending -> loading -> warming -> ready | failed
+        self.value = None
+        self.error = None
+        self.loading_thread = None
+        self.load_seconds = None
+        self.warmup_seconds = None
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+
+class ModelManager:
+    """Lifecycle of the serving models (sign detector, TTS, STT).
+
+    Modules register a loader (and optional warm-up) instead of loading at
+    import time. ``start()`` loads every registered model in parallel
+    background threads; a model that was never started is loaded by the
+    first ``get()``. ``get()`` blocks until the model is ready, so call it
+    from code that already runs off the event loop (model_executor). The
+    /api/ready endpoint reports ``status()`` so login and signaling can
+    serve traffic while models are still loading.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def register(self, name, loader, warmup=None):
+        self._entries[name] = _Entry(name, loader, warmup)
+
+    def start(self, *names):
+        """Begin loading the given models (all when none given) in the background."""
+        for name in names or list(self._entries):
+            entry = self._entries[name]
+            if entry.state == 'pending':
+                threading.Thread(target=self._load, args=(entry,), name=f"load-{name}", daemon=True).start()
+
+    def get(self, name, timeout=None):
+        entry = self._entries[name]
+        if entry.state == 'pending':
+            self._load(entry)
+        if entry.loading_thread == threading.get_ident() and not entry.done.is_set():
+            # A loader or warm-up asking for its own model would wait on itself
+            raise ModelUnavailable(f"{name} requested by its own loader or warm-up")
+        if not entry.done.wait(timeout):
+            raise ModelUnavailable(f"{name} is still loading")
+        if entry.state != 'ready':
+            raise ModelUnavailable(f"{name} failed to load: {entry.error}")
+        return entry.value
+
+    def is_ready(self, name):
+        entry = self._entries.get(name)
+        return entry is not None and entry.state == 'ready'
+
+    def ready(self):
+        return all(entry.state == 'ready' for entry in self._entries.values())
+
+    def status(self):
+        return {
+            name: {
+                'state': entry.state,
+                'load_seconds': entry.load_seconds,
+                'warmup_seconds': entry.warmup_seconds,
+                'error': entry.error,
+            }
+            for name, entry in self._entries.items()
+        }
+
+    def _load(self, entry):
+        with entry.lock:
+            if entry.state != 'pending': return
+            entry.state = 'loading'
+            entry.loading_thread = threading.get_ident()
+
+        started = time.monotonic()
+        try:
+            entry.value = entry.loader()
+            entry.load_seconds = round(time.monotonic() - started, 2)
+
+            if entry.warmup:
+                entry.state = 'warming'
+                started = time.monotonic()
+                try:
+                    entry.warmup(entry.value)
+                except Exception as e:
+                    print(f"⚠️ Warm-up of {entry.name} failed: {e}")
+                entry.warmup_seconds = round(time.monotonic() - started, 2)
+
+            entry.state = 'ready'
+            print(f"✅ {entry.name} model ready ({entry.load_seconds}s load, {entry.warmup_seconds or 0}s warm-up)")
+        except Exception as e:
+            entry.error = str(e)
+            entry.state = 'failed'
+            print(f"❌ Failed to load {entry.name} model: {e}")
+        finally:
+            entry.done.set()
+
+
+# Singleton Instance
+model_manager = ModelManager()
@@ -0,0 +1,101 @@
+import threading
+import numpy as np
+from config import Config
+from utils.audio import SAMPLE_RATE
+
+
+class VoiceActivityDetector:
+    """Energy-based voice activity detection for 16 kHz float32 clips.
+
+    The clip is cut into ``frame_ms`` frames and a frame counts as speech
+    when its energy is above ``threshold_db`` (dBFS) and above the clip's
+    noise floor (10th percentile of frame energies) + ``margin_db`` (capped
+    below the loudest frames, for clips that are speech throughout), so a
+    noisy microphone does not turn everything into speech. A clip whose
+    level hardly varies (stationary noise, hum) has no speech. Speech runs
+    closer than ``min_silence_ms`` are merged, runs shorter than
+    ``min_speech_ms`` are dropped as clicks, and each run is padded by
+    ``padding_ms``. ``split()`` then returns the speech only: silence at
+    the edges is trimmed and clips longer than ``max_clip_s`` are split at
+    the pauses between runs. An empty list means there is no speech at all.
+    """
+
+    def __init__(self, enabled=Config.STT_VAD, threshold_db=Config.STT_VAD_THRESHOLD_DB,
+                 margin_db=10.0, frame_ms=30, min_speech_ms=Config.STT_VAD_MIN_SPEECH_MS,
+                 min_silence_ms=Config.STT_VAD_MIN_SILENCE_MS, padding_ms=Config.STT_VAD_PADDING_MS,
+                 max_clip_s=Config.STT_VAD_MAX_CLIP_S):
+        self.enabled = enabled
+        self.threshold_db = threshold_db
+        self.margin_db = margin_db
+        self.frame = int(frame_ms * SAMPLE_RATE / 1000)
+        self.min_speech = int(min_speech_ms * SAMPLE_RATE / 1000)
+        self.min_silence = int(min_silence_ms * SAMPLE_RATE / 1000)
+        self.padding = int(padding_ms * SAMPLE_RATE / 1000)
+        self.max_clip = int(max_clip_s * SAMPLE_RATE)
+
+        self._lock = threading.Lock()
+        self._stats = {"clips": 0, "rejected": 0, "segments": 0, "audio_s": 0.0, "speech_s": 0.0}
+
+    def frame_energies(self, audio):
+        frames = len(audio) // self.frame
+        if not frames: return np.empty(0, dtype=np.float32)
+        power = np.square(audio[:frames * self.frame].reshape(frames, self.frame)).mean(axis=1)
+        return 10.0 * np.log10(power + 1e-10)
+
+    def speech_regions(self, audio):
+        """(start, end) sample ranges of speech, merged, filtered and padded."""
+        energies = self.frame_energies(audio)
+        if not len(energies): return []
+
+        floor, peak = np.percentile(energies, 10), np.percentile(energies, 99)
+        if peak - floor < self.margin_db: return []
+        threshold = max(self.threshold_db, min(floor + self.margin_db, peak - 2 * self.margin_db))
+        speech = energies > threshold
+
+        # runs of speech frames -> sample ranges
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], speech.astype(np.int8), [0]))))
+        runs = [(start * self.frame, end * self.frame) for start, end in zip(edges[::2], edges[1::2])]
+
+        merged = []
+        for start, end in runs:
+            if merged and start - merged[-1][1] < self.min_silence:
+                merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+
+        return [(max(0, start - self.padding), min(len(audio), end + self.padding))
+                for start, end in merged if end - start >= self.min_speech]
+
+    def split(self, audio):
+        """Speech-only clips of ``audio`` (trimmed, split at pauses); [] when there is no speech."""
+        if not self.enabled:
+            return [audio] if len(audio) else []
+
+        regions = self.speech_regions(audio)
+
+        clips = []
+        for start, end in regions:
+            if clips and end - clips[-1][0] <= self.max_clip:
+                clips[-1] = (clips[-1][0], end)  # keep short pauses inside one clip
+            else:
+                clips.append((start, end))
+        # a single run longer than max_clip is cut into max_clip pieces
+        clips = [(offset, min(end, offset + self.max_clip))
+                 for start, end in clips for offset in range(start, end, self.max_clip)]
+
+        with self._lock:
+            self._stats["clips"] += 1
+            self._stats["rejected"] += 0 if clips else 1
+            self._stats["segments"] += len(clips)
+            self._stats["audio_s"] += len(audio) / SAMPLE_RATE
+            self._stats["speech_s"] += float(sum(end - start for start, end in clips)) / SAMPLE_RATE
+        return [audio[start:end] for start, end in clips]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["speech_ratio"] = round(stats["speech_s"] / stats["audio_s"], 3) if stats["audio_s"] else 0.0
+        stats["audio_s"] = round(stats["audio_s"], 1)
+        stats["speech_s"] = round(stats["speech_s"], 1)
+        stats["enabled"] = self.enabled
+        return stats
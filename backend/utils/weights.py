@@ -0,0 +1,59 @@
+import os
+import torch
+from config import Config
+
+
+def load_state_dict_mmap(model, path, strict=True):
+    """Load a state dict so the parameters point into a read-only file mapping.
+
+    ``torch.load(mmap=True)`` maps the checkpoint privately (copy-on-write) and
+    ``assign=True`` makes the module use those tensors directly instead of
+    copying them into its freshly initialised ones. Every process on the host
+    that loads the same file therefore shares the physical pages. Legacy
+    (non-zip) checkpoints cannot be mapped and fall back to a normal load.
+    """
+    try:
+        state_dict = torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+    except RuntimeError as e:
+        print(f"⚠️ {path} cannot be memory-mapped ({e}), loading a private copy")
+        state_dict = torch.load(path, map_location='cpu')
+    model.load_state_dict(state_dict, strict=strict, assign=True)
+    return model
+
+
+def weights_path(name):
+    """Path of an exported mmap-able checkpoint in MODEL_WEIGHTS_DIR, or None."""
+    if not Config.MODEL_WEIGHTS_DIR: return None
+    path = os.path.join(Config.MODEL_WEIGHTS_DIR, f"{name}.pt")
+    return path if os.path.exists(path) else None
+
+
+def load_pretrained_mmap(model_class, name):
+    """Build a Hugging Face model from MODEL_WEIGHTS_DIR/<name>/ config + <name>.pt.
+
+    Returns None when no export exists, so callers can fall back to
+    ``from_pretrained``. See scripts/export_mmap_weights.py.
+    """
+    path = weights_path(name)
+    if path is None: return None
+
+    config = model_class.config_class.from_pretrained(os.path.join(Config.MODEL_WEIGHTS_DIR, name))
+    model = model_class(config)
+    load_state_dict_mmap(model, path)
+    return model.eval()
+
+
+def load_whisper_mmap(model_name, device='cpu'):
+    """Whisper counterpart of load_pretrained_mmap (whisper_<model_name>.pt holds dims + weights)."""
+    path = weights_path(f"whisper_{model_name}")
+    if path is None: return None
+
+    import whisper
+    from whisper.model import Whisper, ModelDimensions
+
+    checkpoint = torch.load(path, map_location='cpu', mmap=True, weights_only=True)
+    model = Whisper(ModelDimensions(**checkpoint['dims']))
+    model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+    if model_name in whisper._ALIGNMENT_HEADS:
+        model.set_alignment_heads(whisper._ALIGNMENT_HEADS[model_name])
+    return model.to(device)
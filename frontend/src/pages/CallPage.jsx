@@ -13,6 +13,9 @@ import {
   IoSend
 } from "react-icons/io5";
 
+// Stream raw PCM to the server for live captions instead of uploading clips
+const STT_STREAMING = import.meta.env.VITE_STT_STREAMING === 'true';
+
 const peerConnectionConfig = {
   iceServers: [
     { urls: 'stun:stun.l.google.com:19302' },
@@ -43,8 +46,12 @@ export default function CallPage() {
 
   //TTS
   const [textMessage, setTextMessage] = useState("");
+  const [voices, setVoices] = useState([]);
+  const [voice, setVoice] = useState("");
   const audioPlayerRef = useRef(new Audio());
   const audioQueueRef = useRef([]);
+  // Streamed TTS: per stream_id, the next expected seq and chunks that arrived early
+  const audioStreamsRef = useRef({});
   const isPlayingRef = useRef(false);
 
   // sign language
@@ -57,6 +64,7 @@ export default function CallPage() {
   const otherUserRef = useRef(null);
   const isCleaningUpRef = useRef(false);
   const mediaRecorderRef = useRef(null);
+  const sttStreamRef = useRef(null);
 
   const createPeerConnection = (targetUserId) => {
     const pc = new RTCPeerConnection(peerConnectionConfig);
@@ -210,12 +218,19 @@ export default function CallPage() {
     if (isPlayingRef.current || audioQueueRef.current.length === 0) return;
 
     const nextItem = audioQueueRef.current.shift();
+    if (!nextItem.audio) {
+      processAudioQueue();
+      return;
+    }
     isPlayingRef.current = true;
 
     try {
-      const audioSrc = `data:audio/wav;base64,${nextItem.audio}`;
-      audioPlayerRef.current.src = audioSrc;
-      audioPlayerRef.current.play().catch(err => {
+      // Binary attachment -> object URL (released once the next clip starts)
+      const player = audioPlayerRef.current;
+      if (player.src.startsWith('blob:')) URL.revokeObjectURL(player.src);
+      const blob = new Blob([nextItem.audio], { type: nextItem.mime || 'audio/wav' });
+      player.src = URL.createObjectURL(blob);
+      player.play().catch(err => {
         console.error("Autoplay blocked:", err);
         isPlayingRef.current = false;
         processAudioQueue();
@@ -284,15 +299,37 @@ export default function CallPage() {
       }
     };
 
+    // Streaming STT: in-progress caption, replaced by the final stt-result
+    const onSttPartial = ({ text }) => {
+      if (user?.isDeaf) {
+        setCaptions(text);
+        if (captionTimerRef.current) clearTimeout(captionTimerRef.current);
+      }
+    };
+
     // TTS 
-    const onPlayAudioMessage = ({ audio, text }) => {
+    const onPlayAudioMessage = ({ audio, mime, text, stream_id, seq, final }) => {
       console.log(" Received TTS Audio:", text);
 
       // Hearing user -- Play the sound
-      if (!user?.isDeaf) {
-        audioQueueRef.current.push({ audio, text });
-        processAudioQueue();
+      if (user?.isDeaf) return;
+
+      if (stream_id === undefined) {
+        audioQueueRef.current.push({ audio, mime, text });
+      } else {
+        // Queue streamed chunks strictly in seq order
+        const streams = audioStreamsRef.current;
+        const stream = streams[stream_id] || (streams[stream_id] = { next: 0, pending: {} });
+        stream.pending[seq] = { audio, mime, text, final };
+        while (stream.pending[stream.next]) {
+          const chunk = stream.pending[stream.next];
+          delete stream.pending[stream.next];
+          stream.next += 1;
+          audioQueueRef.current.push(chunk);
+          if (chunk.final) delete streams[stream_id];
+        }
       }
+      processAudioQueue();
     };
 
     socket.on('call-accepted', onCallAccepted);
@@ -302,9 +339,19 @@ export default function CallPage() {
     socket.on('mic-toggled', onMicToggled);
     socket.on('video-toggled', onVideoToggled);
     socket.on('stt-result', onSttResult);
+    socket.on('stt-partial', onSttPartial);
     socket.on('play-audio-message', onPlayAudioMessage);
 
+    // TTS voice picker (deaf user's typed text and signs are spoken in it)
+    const onVoices = ({ voices, current }) => {
+      setVoices(voices);
+      setVoice(current || "");
+    };
+    socket.on('voices', onVoices);
+    if (user?.isDeaf) socket.emit('get-voices');
+
     return () => {
+      socket.off('voices', onVoices);
       socket.off('call-accepted', onCallAccepted);
       socket.off('ice-candidate', onIceCandidate);
       socket.off('call-ended', onCallEnded);
@@ -312,6 +359,7 @@ export default function CallPage() {
       socket.off('mic-toggled', onMicToggled);
       socket.off('video-toggled', onVideoToggled);
       socket.off('stt-result', onSttResult);
+      socket.off('stt-partial', onSttPartial);
       socket.off('play-audio-message', onPlayAudioMessage);
     };
   }, [socket, handleHangUp, user, processAudioQueue]);
@@ -383,14 +431,17 @@ export default function CallPage() {
         // Draw the current video frame onto the canvas
         ctx.drawImage(localVideoRef.current, 0, 0, canvas.width, canvas.height);
 
-        // 2. Convert to Base64 (JPEG format, 50% quality to save bandwidth)
-        const frameData = canvas.toDataURL('image/jpeg', 0.5);
+        // 2. Encode as JPEG (50% quality to save bandwidth)
+        canvas.toBlob(async (blob) => {
+          if (!blob) return;
+          const frameData = await blob.arrayBuffer();
 
-        // 3. Send to Backend
-        socket.emit('process-frame', {
-          image: frameData,
-          to: otherUserRef.current
-        });
+          // 3. Send to Backend as a binary attachment (no base64 overhead)
+          socket.emit('process-frame', {
+            image: frameData,
+            to: otherUserRef.current
+          });
+        }, 'image/jpeg', 0.5);
       }
     }, 500); // Send 2 frames per second
 
@@ -443,10 +494,56 @@ export default function CallPage() {
     }
   }, [socket]);
 
+  // STT (streaming): ~256 ms chunks of 16-bit mono PCM at 16 kHz over the
+  // socket (4096 samples per chunk, ~32 KB/s per speaker)
+  const startStreaming = () => {
+    if (sttStreamRef.current) return;
+
+    const audioTrack = localStreamRef.current.getAudioTracks()[0];
+    if (!audioTrack) return;
+
+    // Capture at Whisper's rate: the browser resamples, so the upload is a
+    // third of a default 48 kHz context's (the server still resamples `rate`)
+    const audioCtx = new AudioContext({ sampleRate: 16000 });
+    const source = audioCtx.createMediaStreamSource(new MediaStream([audioTrack]));
+    const processor = audioCtx.createScriptProcessor(4096, 1, 1);
+
+    processor.onaudioprocess = (e) => {
+      if (!otherUserRef.current || !audioTrack.enabled) return;
+      const input = e.inputBuffer.getChannelData(0);
+      const pcm = new Int16Array(input.length);
+      for (let i = 0; i < input.length; i++) {
+        const s = Math.max(-1, Math.min(1, input[i]));
+        pcm[i] = s < 0 ? s * 0x8000 : s * 0x7fff;
+      }
+      socket.emit('stt-audio-chunk', { to: otherUserRef.current, audio: pcm.buffer, rate: audioCtx.sampleRate });
+    };
+
+    source.connect(processor);
+    processor.connect(audioCtx.destination);
+    sttStreamRef.current = { audioCtx, source, processor };
+  };
+
+  const stopStreaming = () => {
+    const stream = sttStreamRef.current;
+    if (!stream) return;
+    sttStreamRef.current = null;
+
+    stream.processor.onaudioprocess = null;
+    stream.processor.disconnect();
+    stream.source.disconnect();
+    stream.audioCtx.close();
+    socket.emit('stt-stream-end', { to: otherUserRef.current });
+  };
+
   // STT
   const startRecording = () => {
     if (user?.isDeaf) return;
     if (!localStreamRef.current) return;
+    if (STT_STREAMING) {
+      startStreaming();
+      return;
+    }
 
     const audioTracks = localStreamRef.current.getAudioTracks();
     if (audioTracks.length === 0) return;
@@ -536,6 +633,7 @@ export default function CallPage() {
 
   const stopRecording = () => {
     try {
+      stopStreaming();
       if (mediaRecorderRef.current) {
         if (mediaRecorderRef.current.state !== "inactive") {
           mediaRecorderRef.current.stop();
@@ -548,6 +646,11 @@ export default function CallPage() {
     }
   };
 
+  const handleVoiceChange = (e) => {
+    setVoice(e.target.value);
+    socket.emit('set-voice', { voice: e.target.value });
+  };
+
   const handleSendText = (e) => {
     e.preventDefault();
     if (!textMessage.trim() || !otherUserRef.current) return;
@@ -619,6 +722,18 @@ export default function CallPage() {
                 onSubmit={handleSendText}
                 className="flex w-full max-w-lg items-center gap-2 bg-gray-900/90 backdrop-blur-md p-2 rounded-full border border-gray-600 shadow-2xl"
               >
+                {voices.length > 1 && (
+                  <select
+                    value={voice}
+                    onChange={handleVoiceChange}
+                    title="Voice"
+                    className="bg-gray-800 text-white text-sm rounded-full px-3 py-2 outline-none border border-gray-600"
+                  >
+                    {voices.map((name) => (
+                      <option key={name} value={name}>{name}</option>
+                    ))}
+                  </select>
+                )}
                 <input
                   type="text"
                   className="flex-grow bg-transparent text-white px-4 py-2 outline-none placeholder-gray-400 font-medium"